@@ -13,24 +13,13 @@ The full license is in the file LICENSE.txt, distributed with this software.
 
 import os
 import platform
-import re
-import ast
-import sys
 import sysconfig
 import subprocess
 
-from setuptools import find_packages, setup
+from setuptools import setup
+from setuptools.command.build_ext import build_ext as _build_ext
 from setuptools.extension import Extension
 
-import numpy as np
-
-
-if sys.version_info.major != 3:
-    sys.exit(
-        "scikit-bio can only be used with Python 3. You are currently "
-        "running Python %d." % sys.version_info.major
-    )
-
 
 def check_bin(ccbin, source, allow_dash):
     """Check if a given compiler matches the specified name."""
@@ -107,53 +96,23 @@ if gcc:
     except (subprocess.CalledProcessError, FileNotFoundError):
         pass
 
-# version parsing from __init__ pulled from Flask's setup.py
-# https://github.com/mitsuhiko/flask/blob/master/setup.py
-_version_re = re.compile(r"__version__\s+=\s+(.*)")
-
-with open("skbio/__init__.py", "rb") as f:
-    hit = _version_re.search(f.read().decode("utf-8")).group(1)
-    version = str(ast.literal_eval(hit))
-
-classes = """
-    Development Status :: 4 - Beta
-    License :: OSI Approved :: BSD License
-    Topic :: Software Development :: Libraries
-    Topic :: Scientific/Engineering
-    Topic :: Scientific/Engineering :: Bio-Informatics
-    Programming Language :: Python :: 3
-    Programming Language :: Python :: 3 :: Only
-    Programming Language :: Python :: 3.8
-    Programming Language :: Python :: 3.9
-    Programming Language :: Python :: 3.10
-    Programming Language :: Python :: 3.11
-    Programming Language :: Python :: 3.12
-    Operating System :: Unix
-    Operating System :: POSIX
-    Operating System :: MacOS :: MacOS X
-"""
-classifiers = [s.strip() for s in classes.split("\n") if s]
-
-description = (
-    "Data structures, algorithms and educational " "resources for bioinformatics."
-)
-
-with open("README.rst") as f:
-    long_description = f.read()
-
-# Dealing with Cython
-USE_CYTHON = os.environ.get("USE_CYTHON")
-if USE_CYTHON is None:
-    # use CYTHON by default
-    USE_CYTHON = True
-elif USE_CYTHON.lower() in {"false", "no"}:
-    USE_CYTHON = False
+# Optimization flags shared by all extensions. By default the extensions are
+# built for the baseline of the target platform, so that wheels run on any CPU;
+# wider SIMD in SSW is then selected at run time. SKBIO_ARCH (e.g. "native" or
+# "x86-64-v3") is passed to -march for builds that only need to run on a known
+# class of CPUs.
+arch = os.environ.get("SKBIO_ARCH", "")
+if platform.system() == "Windows":
+    opt_compile_args = ["/O2"]
 else:
-    USE_CYTHON = True
-
-ext = ".pyx" if USE_CYTHON else ".c"
+    opt_compile_args = ["-O3", "-funroll-loops"]
+    if arch:
+        opt_compile_args.append("-march=" + arch)
 
-ssw_extra_compile_args = ["-I."]
+# SSW is written against SSE2 intrinsics. The vendored SIMDe header next to
+# ssw.c maps them onto NEON on ARM (e.g. Apple Silicon, Graviton) and onto
+# portable C elsewhere, so no extra include path or flags are needed there.
+ssw_extra_compile_args = [] + opt_compile_args
 
 if platform.system() != "Windows":
     if icc:
@@ -179,79 +138,106 @@ if platform.system() != "Windows":
 if platform.machine() == "i686":
     ssw_extra_compile_args.append("-msse2")
 
+# The SSW wrapper and ssw.c are separate translation units; link-time
+# optimization lets the compiler inline across them.
+if platform.system() == "Windows":
+    ssw_extra_compile_args.append("/GL")
+    ssw_extra_link_args = ["/LTCG"]
+else:
+    ssw_extra_compile_args.append("-flto")
+    ssw_extra_link_args = ["-flto"]
+
+# Build against the current NumPy C API only, without the deprecated pre-1.7
+# definitions.
+npy_macros = [("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")]
+
 extensions = [
-    Extension("skbio.metadata._intersection", ["skbio/metadata/_intersection" + ext]),
     Extension(
-        "skbio.stats.__subsample",
-        ["skbio/stats/__subsample" + ext],
-        include_dirs=[np.get_include()],
+        "skbio.metadata._intersection",
+        ["skbio/metadata/_intersection.pyx"],
+        extra_compile_args=opt_compile_args,
+        define_macros=npy_macros,
     ),
     Extension(
         "skbio.alignment._ssw_wrapper",
-        ["skbio/alignment/_ssw_wrapper" + ext, "skbio/alignment/_lib/ssw.c"],
+        ["skbio/alignment/_ssw_wrapper.pyx", "skbio/alignment/_lib/ssw.c"],
         extra_compile_args=ssw_extra_compile_args,
-        include_dirs=[np.get_include()],
+        extra_link_args=ssw_extra_link_args,
+        define_macros=npy_macros,
+    ),
+    Extension(
+        "skbio.alignment._cutils",
+        ["skbio/alignment/_cutils.pyx"],
+        extra_compile_args=stats_extra_compile_args,
+        extra_link_args=stats_extra_link_args,
+        define_macros=npy_macros,
     ),
     Extension(
         "skbio.diversity._phylogenetic",
-        ["skbio/diversity/_phylogenetic" + ext],
-        include_dirs=[np.get_include()],
+        ["skbio/diversity/_phylogenetic.pyx"],
+        extra_compile_args=opt_compile_args,
+        define_macros=npy_macros,
     ),
     Extension(
         "skbio.stats.ordination._cutils",
-        ["skbio/stats/ordination/_cutils" + ext],
+        ["skbio/stats/ordination/_cutils.pyx"],
         extra_compile_args=stats_extra_compile_args,
         extra_link_args=stats_extra_link_args,
+        define_macros=npy_macros,
     ),
     Extension(
         "skbio.stats.distance._cutils",
-        ["skbio/stats/distance/_cutils" + ext],
+        ["skbio/stats/distance/_cutils.pyx"],
         extra_compile_args=stats_extra_compile_args,
         extra_link_args=stats_extra_link_args,
+        define_macros=npy_macros,
     ),
 ]
 
-if USE_CYTHON:
-    from Cython.Build import cythonize
-
-    # Always recompile the pyx files to C if USE_CYTHON is set.
-    extensions = cythonize(extensions, force=True)
-
 
+class build_ext(_build_ext):
+    """Build extensions in parallel unless a job count is given (``-j``).
+
+    Cython and NumPy's headers are used here rather than at import time, so
+    that they come from the (isolated) build environment and metadata-only
+    commands do not need them.
+    """
+
+    def finalize_options(self):
+        super().finalize_options()
+        if self.parallel is None:
+            self.parallel = os.cpu_count() or 1
+
+    def build_extensions(self):
+        import numpy
+        from Cython.Build import cythonize
+
+        self.compiler.add_include_dir(numpy.get_include())
+
+        # Always recompile the pyx files to C, so that the generated code (and
+        # the directives below) always match the installed Cython. Directives
+        # are applied globally; the extensions do not rely on negative or
+        # unchecked indexing.
+        cythonized = cythonize(
+            self.extensions,
+            compiler_directives={
+                "language_level": "3",
+                "boundscheck": False,
+                "wraparound": False,
+                "initializedcheck": False,
+            },
+            force=True,
+        )
+        sources = {e.name: e.sources for e in cythonized}
+        for e in self.extensions:
+            e.sources = sources[e.name]
+
+        super().build_extensions()
+
+
+# Package metadata is declared in setup.cfg; only the extensions are set up
+# here.
 setup(
-    name="scikit-bio",
-    version=version,
-    license="BSD-3-Clause",
-    description=description,
-    long_description=long_description,
-    author="scikit-bio development team",
-    author_email="qiyunzhu@gmail.com",
-    maintainer="scikit-bio development team",
-    maintainer_email="qiyunzhu@gmail.com",
-    url="https://scikit.bio",
-    packages=find_packages(),
     ext_modules=extensions,
-    include_dirs=[np.get_include()],
-    tests_require=["pytest", "coverage"],
-    install_requires=[
-        "requests >= 2.20.0",
-        "decorator >= 3.4.2",
-        "natsort >= 4.0.3",
-        "numpy >= 1.17.0",
-        "pandas >= 1.5.0",
-        "scipy >= 1.9.0",
-        "h5py >= 3.6.0",
-        "biom-format",
-    ],
-    classifiers=classifiers,
-    package_data={
-        "skbio.diversity.alpha.tests": ["data/qiime-191-tt/*"],
-        "skbio.diversity.beta.tests": ["data/qiime-191-tt/*"],
-        "skbio.io.tests": ["data/*"],
-        "skbio.io.format.tests": ["data/*"],
-        "skbio.stats.tests": ["data/*"],
-        "skbio.stats.distance.tests": ["data/*"],
-        "skbio.stats.ordination.tests": ["data/*"],
-        "skbio.metadata.tests": ["data/invalid/*", "data/valid/*"],
-    },
+    cmdclass={"build_ext": build_ext},
 )
@@ -22,6 +22,7 @@ from skbio.stats.ordination import OrdinationResults
 from skbio.table import Table
 import skbio.diversity  # noqa
 import skbio.stats.evolve  # noqa
+from skbio._version import __version__
 
 __all__ = [
     "Sequence",
@@ -42,7 +43,6 @@ __all__ = [
 ]
 
 __credits__ = "https://github.com/scikit-bio/scikit-bio/graphs/contributors"
-__version__ = "0.6.1-dev"
 
 
 mottos = [
@@ -0,0 +1,12 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+# This module is read by setuptools (see setup.cfg) without importing skbio,
+# so it must not import anything.
+
+__version__ = "0.6.1-dev"
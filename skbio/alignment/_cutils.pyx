@@ -0,0 +1,84 @@
+# -----------------------------------------------------------------------------
+#  Copyright (c) 2013--, scikit-bio development team.
+#
+#  Distributed under the terms of the Modified BSD License.
+#
+#  The full license is in the file LICENSE.txt, distributed with this software.
+# -----------------------------------------------------------------------------
+
+cimport cython
+from cython.parallel import prange
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def gap_counts_cy(const unsigned char[:, ::1] packed,
+                  const unsigned char[::1] gap_codes,
+                  Py_ssize_t[::1] counts,
+                  bint per_position):
+    """
+    Count gap characters in each row or column of a byte matrix.
+
+    Each byte is compared against (up to four) gap codes and the matches are
+    accumulated directly, so no intermediate boolean mask is allocated. The
+    comparisons are branch-free, which lets the compiler vectorize the inner
+    loops.
+
+    Parameters
+    ----------
+    packed : 2D array_like of uint8
+        Sequence bytes, one row per sequence.
+    gap_codes : 1D array_like of uint8
+        Byte values of the gap characters. Must contain between one and four
+        values.
+    counts : 1D array_like of intp
+        Output, pre-allocated. Length must be the number of columns of
+        `packed` if `per_position` is true, otherwise the number of rows.
+    per_position : bool
+        If true, count gaps in each column (i.e., across sequences),
+        otherwise in each row (i.e., across positions).
+    """
+    cdef Py_ssize_t n_rows = packed.shape[0]
+    cdef Py_ssize_t n_cols = packed.shape[1]
+    cdef Py_ssize_t n_codes = gap_codes.shape[0]
+    cdef Py_ssize_t row, col, row_count
+    cdef const unsigned char* row_bytes
+    cdef Py_ssize_t* col_counts
+    cdef unsigned char g0, g1, g2, g3, x
+
+    assert 1 <= n_codes <= 4
+    if per_position:
+        assert counts.shape[0] == n_cols
+    else:
+        assert counts.shape[0] == n_rows
+
+    counts[:] = 0
+    if n_rows == 0 or n_cols == 0:
+        return
+
+    # pad with the first code so that the comparisons below need no branches
+    g0 = gap_codes[0]
+    g1 = gap_codes[1] if n_codes > 1 else g0
+    g2 = gap_codes[2] if n_codes > 2 else g0
+    g3 = gap_codes[3] if n_codes > 3 else g0
+
+    if per_position:
+        # rows are traversed in order so that the inner loop streams through
+        # contiguous memory. Indexing through plain pointers (rather than the
+        # memoryviews) lets the compiler vectorize it.
+        col_counts = &counts[0]
+        with nogil:
+            for row in range(n_rows):
+                row_bytes = &packed[row, 0]
+                for col in range(n_cols):
+                    x = row_bytes[col]
+                    col_counts[col] += (x == g0) | (x == g1) | (x == g2) | (x == g3)
+    else:
+        for row in prange(n_rows, nogil=True):
+            row_bytes = &packed[row, 0]
+            row_count = 0
+            for col in range(n_cols):
+                x = row_bytes[col]
+                row_count = row_count + (
+                    (x == g0) | (x == g1) | (x == g2) | (x == g3))
+            counts[row] = row_count
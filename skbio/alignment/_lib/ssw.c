@@ -35,6 +35,13 @@
  *
  */
 
+/* AVX2 and AVX-512BW kernels are compiled with function-level target attributes and selected at run time, so the
+   extension itself still runs on any x86-64 CPU. Other platforms only use the SSE2 (SIMDe) kernels. */
+#if defined(__x86_64__) && !defined(_WIN32) && (defined(__clang__) || __GNUC__ >= 7)
+#define SSW_HAVE_AVX 1
+#include <immintrin.h>
+#endif
+
 #define SIMDE_ENABLE_NATIVE_ALIASES
 #include "simde-sse2.h"
 #include <stdint.h>
@@ -77,13 +84,16 @@ typedef struct {
 } cigar;
 
 struct _profile{
-    __m128i* profile_byte;  // 0: none
-    __m128i* profile_word;  // 0: none
+    void* profile_byte;  // 0: none
+    void* profile_word;  // 0: none
     const int8_t* read;
     const int8_t* mat;
     int32_t readLen;
     int32_t n;
     uint8_t bias;
+    int8_t simd;    // SSW_SIMD_* instruction set the profiles are laid out for
+    void* profile_byte_sse2;  // SSE2 copies for the fallback to SSE2 in ssw_align;
+    void* profile_word_sse2;  // 0 when simd is SSW_SIMD_SSE2
 };
 
 /* Generate query profile rearrange query sequence & calculate the weight of match/mismatch. */
@@ -547,6 +557,327 @@ end:
     return bests;
 }
 
+#ifdef SSW_HAVE_AVX
+
+/* Allocate zeroed memory aligned for any vector width. Release with free(). */
+static void* ssw_calloc_aligned (size_t count, size_t size) {
+    void* p = 0;
+    if (posix_memalign(&p, 64, count * size) != 0) return 0;
+    memset(p, 0, count * size);
+    return p;
+}
+
+/* Same as qP_byte and qP_word, for vectors of the given number of bytes. Return 0 if allocation fails. */
+static void* qP_byte_wide (const int8_t* read_num,
+                           const int8_t* mat,
+                           const int32_t readLen,
+                           const int32_t n,
+                           uint8_t bias,
+                           int32_t bytes) {
+
+    int32_t segLen = (readLen + bytes - 1) / bytes;
+    int8_t* vProfile = (int8_t*)ssw_calloc_aligned(n * segLen, bytes);
+    int8_t* t = vProfile;
+    int32_t nt, i, j, segNum;
+    if (!vProfile) return 0;
+
+    for (nt = 0; LIKELY(nt < n); nt ++) {
+        for (i = 0; i < segLen; i ++) {
+            j = i;
+            for (segNum = 0; LIKELY(segNum < bytes) ; segNum ++) {
+                *t++ = j>= readLen ? bias : mat[nt * n + read_num[j]] + bias;
+                j += segLen;
+            }
+        }
+    }
+    return vProfile;
+}
+
+static void* qP_word_wide (const int8_t* read_num,
+                           const int8_t* mat,
+                           const int32_t readLen,
+                           const int32_t n,
+                           int32_t bytes) {
+
+    int32_t lanes = bytes / 2;
+    int32_t segLen = (readLen + lanes - 1) / lanes;
+    int16_t* vProfile = (int16_t*)ssw_calloc_aligned(n * segLen, bytes);
+    int16_t* t = vProfile;
+    int32_t nt, i, j, segNum;
+    if (!vProfile) return 0;
+
+    for (nt = 0; LIKELY(nt < n); nt ++) {
+        for (i = 0; i < segLen; i ++) {
+            j = i;
+            for (segNum = 0; LIKELY(segNum < lanes) ; segNum ++) {
+                *t++ = j>= readLen ? 0 : mat[nt * n + read_num[j]];
+                j += segLen;
+            }
+        }
+    }
+    return vProfile;
+}
+
+/* AVX2: 32 x 8-bit / 16 x 16-bit lanes. AVX2 byte shifts stay within 128-bit halves, so the low half is carried into
+   the high half with a permute. */
+#define SSW_TARGET __attribute__((target("avx2")))
+
+static inline SSW_TARGET __m256i ssw_shl8_avx2 (__m256i v) {
+    return _mm256_alignr_epi8(v, _mm256_permute2x128_si256(v, v, 0x08), 15);
+}
+
+static inline SSW_TARGET __m256i ssw_shl16_avx2 (__m256i v) {
+    return _mm256_alignr_epi8(v, _mm256_permute2x128_si256(v, v, 0x08), 14);
+}
+
+static inline SSW_TARGET uint8_t ssw_hmax8_avx2 (__m256i v) {
+    __m128i m = _mm_max_epu8(_mm256_castsi256_si128(v), _mm256_extracti128_si256(v, 1));
+    m = _mm_max_epu8(m, _mm_srli_si128(m, 8));
+    m = _mm_max_epu8(m, _mm_srli_si128(m, 4));
+    m = _mm_max_epu8(m, _mm_srli_si128(m, 2));
+    m = _mm_max_epu8(m, _mm_srli_si128(m, 1));
+    return (uint8_t)_mm_cvtsi128_si32(m);
+}
+
+static inline SSW_TARGET uint16_t ssw_hmax16_avx2 (__m256i v) {
+    __m128i m = _mm_max_epi16(_mm256_castsi256_si128(v), _mm256_extracti128_si256(v, 1));
+    m = _mm_max_epi16(m, _mm_srli_si128(m, 8));
+    m = _mm_max_epi16(m, _mm_srli_si128(m, 4));
+    m = _mm_max_epi16(m, _mm_srli_si128(m, 2));
+    return (uint16_t)_mm_cvtsi128_si32(m);
+}
+
+static inline SSW_TARGET __m256i ssw_carry8_avx2 (__m256i v, const __m256i* vDecay) {
+    __m256i t = _mm256_permute2x128_si256(v, v, 0x08);
+    v = _mm256_alignr_epi8(v, t, 15);
+    t = _mm256_permute2x128_si256(v, v, 0x08);
+    v = _mm256_max_epu8(v, _mm256_subs_epu8(_mm256_alignr_epi8(v, t, 15), vDecay[0]));
+    t = _mm256_permute2x128_si256(v, v, 0x08);
+    v = _mm256_max_epu8(v, _mm256_subs_epu8(_mm256_alignr_epi8(v, t, 14), vDecay[1]));
+    t = _mm256_permute2x128_si256(v, v, 0x08);
+    v = _mm256_max_epu8(v, _mm256_subs_epu8(_mm256_alignr_epi8(v, t, 12), vDecay[2]));
+    t = _mm256_permute2x128_si256(v, v, 0x08);
+    v = _mm256_max_epu8(v, _mm256_subs_epu8(_mm256_alignr_epi8(v, t, 8), vDecay[3]));
+    t = _mm256_permute2x128_si256(v, v, 0x08);
+    v = _mm256_max_epu8(v, _mm256_subs_epu8(t, vDecay[4]));
+    return v;
+}
+
+#define SSW_FN(name) name##_avx2
+#define SSW_VEC __m256i
+#define SSW_BYTES 32
+#define SSW_LOG2_BYTES 5
+#define vZERO() _mm256_setzero_si256()
+#define vSET8(x) _mm256_set1_epi8((char)(x))
+#define vSET16(x) _mm256_set1_epi16((short)(x))
+#define vLOAD(p) _mm256_load_si256(p)
+#define vSTORE(p, v) _mm256_store_si256((p), (v))
+#define vAND _mm256_and_si256
+#define vADDS8 _mm256_adds_epu8
+#define vSUBS8 _mm256_subs_epu8
+#define vMAX8 _mm256_max_epu8
+#define vADDS16 _mm256_adds_epi16
+#define vSUBS16 _mm256_subs_epu16
+#define vMAX16 _mm256_max_epi16
+#define vSHL8 ssw_shl8_avx2
+#define vSHL16 ssw_shl16_avx2
+#define vEQ8(a, b) (_mm256_movemask_epi8(_mm256_cmpeq_epi8((a), (b))) == -1)
+#define vEQ16(a, b) (_mm256_movemask_epi8(_mm256_cmpeq_epi16((a), (b))) == -1)
+#define vANYGT16(a, b) _mm256_movemask_epi8(_mm256_cmpgt_epi16((a), (b)))
+#define vHMAX8 ssw_hmax8_avx2
+#define vHMAX16 ssw_hmax16_avx2
+#define vCARRY8 ssw_carry8_avx2
+#include "ssw_avx.h"
+#undef SSW_TARGET
+#undef SSW_FN
+#undef SSW_VEC
+#undef SSW_BYTES
+#undef SSW_LOG2_BYTES
+#undef vZERO
+#undef vSET8
+#undef vSET16
+#undef vLOAD
+#undef vSTORE
+#undef vAND
+#undef vADDS8
+#undef vSUBS8
+#undef vMAX8
+#undef vADDS16
+#undef vSUBS16
+#undef vMAX16
+#undef vSHL8
+#undef vSHL16
+#undef vEQ8
+#undef vEQ16
+#undef vANYGT16
+#undef vHMAX8
+#undef vHMAX16
+#undef vCARRY8
+
+/* AVX-512BW: 64 x 8-bit / 32 x 16-bit lanes. The 128-bit blocks are rotated up by one block (zeroing the lowest)
+   before the per-block byte alignment. */
+#define SSW_TARGET __attribute__((target("avx512bw")))
+
+static inline SSW_TARGET __m512i ssw_shl8_avx512bw (__m512i v) {
+    return _mm512_alignr_epi8(v, _mm512_maskz_shuffle_i64x2(0xFC, v, v, 0x90), 15);
+}
+
+static inline SSW_TARGET __m512i ssw_shl16_avx512bw (__m512i v) {
+    return _mm512_alignr_epi8(v, _mm512_maskz_shuffle_i64x2(0xFC, v, v, 0x90), 14);
+}
+
+static inline SSW_TARGET uint8_t ssw_hmax8_avx512bw (__m512i v) {
+    return ssw_hmax8_avx2(_mm256_max_epu8(_mm512_castsi512_si256(v), _mm512_extracti64x4_epi64(v, 1)));
+}
+
+static inline SSW_TARGET uint16_t ssw_hmax16_avx512bw (__m512i v) {
+    return ssw_hmax16_avx2(_mm256_max_epi16(_mm512_castsi512_si256(v), _mm512_extracti64x4_epi64(v, 1)));
+}
+
+static inline SSW_TARGET __m512i ssw_carry8_avx512bw (__m512i v, const __m512i* vDecay) {
+    __m512i t = _mm512_maskz_shuffle_i64x2(0xFC, v, v, 0x90);
+    v = _mm512_alignr_epi8(v, t, 15);
+    t = _mm512_maskz_shuffle_i64x2(0xFC, v, v, 0x90);
+    v = _mm512_max_epu8(v, _mm512_subs_epu8(_mm512_alignr_epi8(v, t, 15), vDecay[0]));
+    t = _mm512_maskz_shuffle_i64x2(0xFC, v, v, 0x90);
+    v = _mm512_max_epu8(v, _mm512_subs_epu8(_mm512_alignr_epi8(v, t, 14), vDecay[1]));
+    t = _mm512_maskz_shuffle_i64x2(0xFC, v, v, 0x90);
+    v = _mm512_max_epu8(v, _mm512_subs_epu8(_mm512_alignr_epi8(v, t, 12), vDecay[2]));
+    t = _mm512_maskz_shuffle_i64x2(0xFC, v, v, 0x90);
+    v = _mm512_max_epu8(v, _mm512_subs_epu8(_mm512_alignr_epi8(v, t, 8), vDecay[3]));
+    t = _mm512_maskz_shuffle_i64x2(0xFC, v, v, 0x90);
+    v = _mm512_max_epu8(v, _mm512_subs_epu8(t, vDecay[4]));
+    t = _mm512_maskz_shuffle_i64x2(0xF0, v, v, 0x40);
+    v = _mm512_max_epu8(v, _mm512_subs_epu8(t, vDecay[5]));
+    return v;
+}
+
+#define SSW_FN(name) name##_avx512bw
+#define SSW_VEC __m512i
+#define SSW_BYTES 64
+#define SSW_LOG2_BYTES 6
+#define vZERO() _mm512_setzero_si512()
+#define vSET8(x) _mm512_set1_epi8((char)(x))
+#define vSET16(x) _mm512_set1_epi16((short)(x))
+#define vLOAD(p) _mm512_load_si512(p)
+#define vSTORE(p, v) _mm512_store_si512((p), (v))
+#define vAND _mm512_and_si512
+#define vADDS8 _mm512_adds_epu8
+#define vSUBS8 _mm512_subs_epu8
+#define vMAX8 _mm512_max_epu8
+#define vADDS16 _mm512_adds_epi16
+#define vSUBS16 _mm512_subs_epu16
+#define vMAX16 _mm512_max_epi16
+#define vSHL8 ssw_shl8_avx512bw
+#define vSHL16 ssw_shl16_avx512bw
+#define vEQ8(a, b) (_mm512_cmpeq_epi8_mask((a), (b)) == UINT64_MAX)
+#define vEQ16(a, b) (_mm512_cmpeq_epi16_mask((a), (b)) == UINT32_MAX)
+#define vANYGT16(a, b) _mm512_cmpgt_epi16_mask((a), (b))
+#define vHMAX8 ssw_hmax8_avx512bw
+#define vHMAX16 ssw_hmax16_avx512bw
+#define vCARRY8 ssw_carry8_avx512bw
+#include "ssw_avx.h"
+#undef SSW_TARGET
+#undef SSW_FN
+#undef SSW_VEC
+#undef SSW_BYTES
+#undef SSW_LOG2_BYTES
+#undef vZERO
+#undef vSET8
+#undef vSET16
+#undef vLOAD
+#undef vSTORE
+#undef vAND
+#undef vADDS8
+#undef vSUBS8
+#undef vMAX8
+#undef vADDS16
+#undef vSUBS16
+#undef vMAX16
+#undef vSHL8
+#undef vSHL16
+#undef vEQ8
+#undef vEQ16
+#undef vANYGT16
+#undef vHMAX8
+#undef vHMAX16
+#undef vCARRY8
+
+#endif  // SSW_HAVE_AVX
+
+static int8_t ssw_simd = -1;
+
+/* Widest instruction set supported by the running CPU (and enabled by the OS). */
+static int8_t ssw_simd_supported (void) {
+#ifdef SSW_HAVE_AVX
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx512bw")) return SSW_SIMD_AVX512BW;
+    if (__builtin_cpu_supports("avx2")) return SSW_SIMD_AVX2;
+#endif
+    return SSW_SIMD_SSE2;
+}
+
+int8_t ssw_simd_level (void) {
+    if (ssw_simd < 0) ssw_simd = ssw_simd_supported();
+    return ssw_simd;
+}
+
+int8_t ssw_set_simd_level (int8_t level) {
+    int8_t supported = ssw_simd_supported();
+    if (level < SSW_SIMD_SSE2) level = SSW_SIMD_SSE2;
+    ssw_simd = level > supported ? supported : level;
+    return ssw_simd;
+}
+
+/* Dispatch profile generation and alignment to the kernels matching the profile's instruction set. */
+static void* ssw_qP_byte (int8_t simd, const int8_t* read_num, const int8_t* mat, const int32_t readLen,
+                          const int32_t n, uint8_t bias) {
+#ifdef SSW_HAVE_AVX
+    if (simd == SSW_SIMD_AVX512BW) return qP_byte_wide(read_num, mat, readLen, n, bias, 64);
+    if (simd == SSW_SIMD_AVX2) return qP_byte_wide(read_num, mat, readLen, n, bias, 32);
+#endif
+    return qP_byte(read_num, mat, readLen, n, bias);
+}
+
+static void* ssw_qP_word (int8_t simd, const int8_t* read_num, const int8_t* mat, const int32_t readLen,
+                          const int32_t n) {
+#ifdef SSW_HAVE_AVX
+    if (simd == SSW_SIMD_AVX512BW) return qP_word_wide(read_num, mat, readLen, n, 64);
+    if (simd == SSW_SIMD_AVX2) return qP_word_wide(read_num, mat, readLen, n, 32);
+#endif
+    return qP_word(read_num, mat, readLen, n);
+}
+
+static alignment_end* ssw_sw_byte (int8_t simd, const int8_t* ref, int8_t ref_dir, int32_t refLen, int32_t readLen,
+                                   const uint8_t weight_gapO, const uint8_t weight_gapE, void* vProfile,
+                                   uint8_t terminate, uint8_t bias, int32_t maskLen) {
+#ifdef SSW_HAVE_AVX
+    if (simd == SSW_SIMD_AVX512BW)
+        return sw_byte_avx512bw(ref, ref_dir, refLen, readLen, weight_gapO, weight_gapE, (__m512i*)vProfile,
+                                terminate, bias, maskLen);
+    if (simd == SSW_SIMD_AVX2)
+        return sw_byte_avx2(ref, ref_dir, refLen, readLen, weight_gapO, weight_gapE, (__m256i*)vProfile,
+                            terminate, bias, maskLen);
+#endif
+    return sw_sse2_byte(ref, ref_dir, refLen, readLen, weight_gapO, weight_gapE, (__m128i*)vProfile,
+                        terminate, bias, maskLen);
+}
+
+static alignment_end* ssw_sw_word (int8_t simd, const int8_t* ref, int8_t ref_dir, int32_t refLen, int32_t readLen,
+                                   const uint8_t weight_gapO, const uint8_t weight_gapE, void* vProfile,
+                                   uint16_t terminate, int32_t maskLen) {
+#ifdef SSW_HAVE_AVX
+    if (simd == SSW_SIMD_AVX512BW)
+        return sw_word_avx512bw(ref, ref_dir, refLen, readLen, weight_gapO, weight_gapE, (__m512i*)vProfile,
+                                terminate, maskLen);
+    if (simd == SSW_SIMD_AVX2)
+        return sw_word_avx2(ref, ref_dir, refLen, readLen, weight_gapO, weight_gapE, (__m256i*)vProfile,
+                            terminate, maskLen);
+#endif
+    return sw_sse2_word(ref, ref_dir, refLen, readLen, weight_gapO, weight_gapE, (__m128i*)vProfile,
+                        terminate, maskLen);
+}
+
 cigar* banded_sw (const int8_t* ref,
                  const int8_t* read, 
                  int32_t refLen, 
@@ -580,10 +911,6 @@ cigar* banded_sw (const int8_t* ref,
         while (width_d * readLen * 3 >= s2) {
             ++s2;
             kroundup32(s2);
-            if (s2 < 0) {
-                fprintf(stderr, "Alignment score and position are not consensus.\n");
-                exit(1);
-            }
             direction = (int8_t*)realloc(direction, s2 * sizeof(int8_t)); 
         }
         direction_line = direction;
@@ -627,6 +954,11 @@ cigar* banded_sw (const int8_t* ref,
             }
             for (j = 1; j <= u; j ++) h_b[j] = h_c[j];
         }
+        /* A wider band cannot reach a higher score once the band covers the whole matrix. */
+        if (max < score && band_width >= readLen && band_width >= refLen) {
+            fprintf(stderr, "Alignment score and position are not consensus.\n");
+            goto fail;
+        }
         band_width *= 2;
     } while (LIKELY(max < score));
     band_width /= 2;
@@ -672,7 +1004,7 @@ cigar* banded_sw (const int8_t* ref,
                 break;
             default: 
                 fprintf(stderr, "Trace back error: %d.\n", direction_line[temp1 - 1]);
-                return 0;
+                goto fail;
         }
         if (f == max) ++e;
         else {
@@ -725,6 +1057,15 @@ cigar* banded_sw (const int8_t* ref,
     free(h_b);
     free(c);
     return result;
+
+fail:
+    free(direction);
+    free(h_c);
+    free(e_b);
+    free(h_b);
+    free(c);
+    free(result);
+    return 0;
 }
 
 int8_t* seq_reverse(const int8_t* seq, int32_t end) /* end is 0-based alignment ending position */  
@@ -741,31 +1082,57 @@ int8_t* seq_reverse(const int8_t* seq, int32_t end) /* end is 0-based alignment
 }
         
 s_profile* ssw_init (const int8_t* read, const int32_t readLen, const int8_t* mat, const int32_t n, const int8_t score_size) {
+    return ssw_init_simd(read, readLen, mat, n, score_size, ssw_simd_level());
+}
+
+s_profile* ssw_init_simd (const int8_t* read, const int32_t readLen, const int8_t* mat, const int32_t n,
+                          const int8_t score_size, const int8_t simd) {
     s_profile* p = (s_profile*)calloc(1, sizeof(struct _profile));
+    if (!p) return 0;
     p->profile_byte = 0;
     p->profile_word = 0;
+    p->profile_byte_sse2 = 0;
+    p->profile_word_sse2 = 0;
     p->bias = 0;
-    
+    p->simd = simd;
+
+    /* Find the bias to use in the substitution matrix */
+    int32_t bias = 0, i;
+    for (i = 0; i < n*n; i++) if (mat[i] < bias) bias = mat[i];
+    bias = abs(bias);
+    p->bias = bias;
+
     if (score_size == 0 || score_size == 2) {
-        /* Find the bias to use in the substitution matrix */
-        int32_t bias = 0, i;
-        for (i = 0; i < n*n; i++) if (mat[i] < bias) bias = mat[i];
-        bias = abs(bias);
+        p->profile_byte = ssw_qP_byte (p->simd, read, mat, readLen, n, bias);
+        if (!p->profile_byte) goto fail;
+    }
+    if (score_size == 1 || score_size == 2) {
+        p->profile_word = ssw_qP_word (p->simd, read, mat, readLen, n);
+        if (!p->profile_word) goto fail;
+    }
 
-        p->bias = bias;
-        p->profile_byte = qP_byte (read, mat, readLen, n, bias);
+    /* Build the SSE2 profiles for the fallback in ssw_align here rather than per call. ssw_align then never writes to
+       the profile, so threads can share it. */
+    if (p->simd != SSW_SIMD_SSE2) {
+        if (p->profile_byte && !(p->profile_byte_sse2 = qP_byte (read, mat, readLen, n, bias))) goto fail;
+        if (p->profile_word && !(p->profile_word_sse2 = qP_word (read, mat, readLen, n))) goto fail;
     }
-    if (score_size == 1 || score_size == 2) p->profile_word = qP_word (read, mat, readLen, n);
     p->read = read;
     p->mat = mat;
     p->readLen = readLen;
     p->n = n;
     return p;
+
+fail:
+    init_destroy(p);
+    return 0;
 }
 
 void init_destroy (s_profile* p) {
     free(p->profile_byte);
     free(p->profile_word);
+    free(p->profile_byte_sse2);
+    free(p->profile_word_sse2);
     free(p);
 }
 
@@ -777,14 +1144,20 @@ s_align* ssw_align (const s_profile* prof,
                     const uint8_t flag, //  (from high to low) bit 5: return the best alignment beginning position; 6: if (ref_end1 - ref_begin1 <= filterd) && (read_end1 - read_begin1 <= filterd), return cigar; 7: if max score >= filters, return cigar; 8: always return cigar; if 6 & 7 are both setted, only return cigar when both filter fulfilled
                     const uint16_t filters,
                     const int32_t filterd,
-                    const int32_t maskLen) {
+                    const int32_t maskLen,
+                    int8_t* error) {
 
     alignment_end* bests = 0, *bests_reverse = 0;
-    __m128i* vP = 0;
+    void* vP = 0;
     int32_t word = 0, band_width = 0, readLen = prof->readLen;
     int8_t* read_reverse = 0;
+    int8_t simd = prof->simd;
+    void* profile_byte = prof->profile_byte, *profile_word = prof->profile_word;
+    int8_t err = SSW_ERROR_MEMORY;
     cigar* path;
     s_align* r = (s_align*)calloc(1, sizeof(s_align));
+    if (error) *error = SSW_ERROR_NONE;
+    if (!r) goto fail;
     r->ref_begin1 = -1;
     r->read_begin1 = -1;
     r->cigar = 0;
@@ -793,24 +1166,39 @@ s_align* ssw_align (const s_profile* prof,
         fprintf(stderr, "When maskLen < 15, the function ssw_align doesn't return 2nd best alignment information.\n");
     }
 
+    /* The Lazy_F loop is only exact when opening a gap costs more than extending one and at least as much as the
+       largest mismatch penalty. Otherwise (an insertion next to a deletion can beat a mismatch, or a vertical gap
+       stops being carried down too early) the result depends on how the query is striped across lanes, and so on
+       the vector width. Use the SSE2 kernels there to give the same results on every CPU. */
+    if (simd != SSW_SIMD_SSE2 && (weight_gapO < prof->bias || weight_gapO <= weight_gapE)) {
+        simd = SSW_SIMD_SSE2;
+        profile_byte = prof->profile_byte_sse2;
+        profile_word = prof->profile_word_sse2;
+    }
+
     // Find the alignment scores and ending positions
-    if (prof->profile_byte) {
-        bests = sw_sse2_byte(ref, 0, refLen, readLen, weight_gapO, weight_gapE, prof->profile_byte, -1, prof->bias, maskLen);
-        if (prof->profile_word && bests[0].score == 255) {
+    if (profile_byte) {
+        bests = ssw_sw_byte(simd, ref, 0, refLen, readLen, weight_gapO, weight_gapE, profile_byte, -1, prof->bias, maskLen);
+        if (!bests) goto fail;
+        if (profile_word && bests[0].score == 255) {
             free(bests);
-            bests = sw_sse2_word(ref, 0, refLen, readLen, weight_gapO, weight_gapE, prof->profile_word, -1, maskLen);
+            bests = ssw_sw_word(simd, ref, 0, refLen, readLen, weight_gapO, weight_gapE, profile_word, -1, maskLen);
             word = 1;
         } else if (bests[0].score == 255) {
             fprintf(stderr, "Please set 2 to the score_size parameter of the function ssw_init, otherwise the alignment results will be incorrect.\n");
-            return 0;
+            free(bests);
+            err = SSW_ERROR_SCORE_SIZE;
+            goto fail;
         }
-    }else if (prof->profile_word) {
-        bests = sw_sse2_word(ref, 0, refLen, readLen, weight_gapO, weight_gapE, prof->profile_word, -1, maskLen);
+    }else if (profile_word) {
+        bests = ssw_sw_word(simd, ref, 0, refLen, readLen, weight_gapO, weight_gapE, profile_word, -1, maskLen);
         word = 1;
     }else {
         fprintf(stderr, "Please call the function ssw_init before ssw_align.\n");
-        return 0;
+        err = SSW_ERROR_PROFILE;
+        goto fail;
     }
+    if (!bests) goto fail;
     r->score1 = bests[0].score;
     r->ref_end1 = bests[0].ref;
     r->read_end1 = bests[0].read;
@@ -827,14 +1215,15 @@ s_align* ssw_align (const s_profile* prof,
     // Find the beginning position of the best alignment.
     read_reverse = seq_reverse(prof->read, r->read_end1);
     if (word == 0) {
-        vP = qP_byte(read_reverse, prof->mat, r->read_end1 + 1, prof->n, prof->bias);
-        bests_reverse = sw_sse2_byte(ref, 1, r->ref_end1 + 1, r->read_end1 + 1, weight_gapO, weight_gapE, vP, r->score1, prof->bias, maskLen);
+        vP = ssw_qP_byte(simd, read_reverse, prof->mat, r->read_end1 + 1, prof->n, prof->bias);
+        if (vP) bests_reverse = ssw_sw_byte(simd, ref, 1, r->ref_end1 + 1, r->read_end1 + 1, weight_gapO, weight_gapE, vP, r->score1, prof->bias, maskLen);
     } else {
-        vP = qP_word(read_reverse, prof->mat, r->read_end1 + 1, prof->n);
-        bests_reverse = sw_sse2_word(ref, 1, r->ref_end1 + 1, r->read_end1 + 1, weight_gapO, weight_gapE, vP, r->score1, maskLen);
+        vP = ssw_qP_word(simd, read_reverse, prof->mat, r->read_end1 + 1, prof->n);
+        if (vP) bests_reverse = ssw_sw_word(simd, ref, 1, r->ref_end1 + 1, r->read_end1 + 1, weight_gapO, weight_gapE, vP, r->score1, maskLen);
     }
     free(vP);
     free(read_reverse);
+    if (!bests_reverse) goto fail;
     r->ref_begin1 = bests_reverse[0].ref;
     r->read_begin1 = r->read_end1 - bests_reverse[0].read;
     free(bests_reverse);
@@ -845,15 +1234,21 @@ s_align* ssw_align (const s_profile* prof,
     readLen = r->read_end1 - r->read_begin1 + 1;
     band_width = abs(refLen - readLen) + 1;
     path = banded_sw(ref + r->ref_begin1, prof->read + r->read_begin1, refLen, readLen, r->score1, weight_gapO, weight_gapE, band_width, prof->mat, prof->n);
-    if (path == 0) r = 0;
-    else {
-        r->cigar = path->seq;
-        r->cigarLen = path->length;
-        free(path);
+    if (path == 0) {
+        err = SSW_ERROR_TRACEBACK;
+        goto fail;
     }
+    r->cigar = path->seq;
+    r->cigarLen = path->length;
+    free(path);
     
 end: 
     return r;
+
+fail:
+    if (error) *error = err;
+    free(r);
+    return 0;
 }
 
 void align_destroy (s_align* a) {
@@ -58,7 +58,7 @@ extern "C" {
     @param  n   the square root of the number of elements in mat (mat has n*n elements)
     @param  score_size  estimated Smith-Waterman score; if your estimated best alignment score is surely < 255 please set 0; if 
                         your estimated best alignment score >= 255, please set 1; if you don't know, please set 2 
-    @return pointer to the query profile structure
+    @return pointer to the query profile structure; 0 if memory cannot be allocated
     @note   example for parameter read and mat:
             If the query sequence is: ACGTATC, the sequence that read points to can be: 1234142
             Then if the penalty for match is 2 and for mismatch is -2, the substitution matrix of parameter mat will be:
@@ -71,6 +71,15 @@ extern "C" {
 */
 s_profile* ssw_init (const int8_t* read, const int32_t readLen, const int8_t* mat, const int32_t n, const int8_t score_size);
 
+/*! @function   Same as ssw_init, but lay the profile out for the given instruction set instead of ssw_simd_level().
+    @param  simd    one of SSW_SIMD_SSE2, SSW_SIMD_AVX2 or SSW_SIMD_AVX512BW, as returned by ssw_simd_level or
+                    ssw_set_simd_level
+    @note   Unlike ssw_init, this function does not read the global instruction set, so it can run concurrently with
+            ssw_set_simd_level.
+*/
+s_profile* ssw_init_simd (const int8_t* read, const int32_t readLen, const int8_t* mat, const int32_t n,
+                          const int8_t score_size, const int8_t simd);
+
 /*! @function   Release the memory allocated by function ssw_init.
     @param  p   pointer to the query profile structure  
 */
@@ -103,7 +112,9 @@ void init_destroy (s_profile* p);
                     picking the scores that belong to the alignments sharing the partial best alignment, SSW C library masks the 
                     reference loci nearby (mask length = maskLen) the best alignment ending position and locates the second largest 
                     score from the unmasked elements.
-    @return pointer to the alignment result structure 
+    @param  error   if not 0, set to SSW_ERROR_NONE on success, or to one of the other SSW_ERROR_* codes giving the
+                    reason when the function returns 0
+    @return pointer to the alignment result structure; 0 if the alignment fails
     @note   Whatever the parameter flag is setted, this function will at least return the optimal and sub-optimal alignment score,
             and the optimal alignment ending positions on target and query sequences. If both bit 6 and 7 of the flag are setted
             while bit 8 is not, the function will return cigar only when both criteria are fulfilled. All returned positions are 
@@ -117,13 +128,43 @@ s_align* ssw_align (const s_profile* prof,
                     const uint8_t flag, 
                     const uint16_t filters,
                     const int32_t filterd,
-                    const int32_t maskLen);
+                    const int32_t maskLen,
+                    int8_t* error);
 
 /*! @function   Release the memory allocated by function ssw_align.
     @param  a   pointer to the alignment result structure
 */
 void align_destroy (s_align* a);
 
+/*! @function   Get the SIMD instruction set used by function ssw_init.
+    @return one of SSW_SIMD_SSE2, SSW_SIMD_AVX2 or SSW_SIMD_AVX512BW
+    @note   On first use the widest instruction set supported by the running CPU is selected. SSW_SIMD_SSE2 is
+            backed by SIMDe and is therefore also used on non-x86 platforms. Function ssw_align falls back to
+            SSW_SIMD_SSE2 when weight_gapO is smaller than the largest penalty in the substitution matrix or not
+            larger than weight_gapE, so that results do not depend on the instruction set.
+*/
+int8_t ssw_simd_level (void);
+
+/*! @function   Set the SIMD instruction set used by function ssw_init.
+    @param  level   requested instruction set; it is lowered to the widest one supported by the running CPU
+    @return the instruction set that will be used
+    @note   Profiles created before the call keep the instruction set they were created with. The instruction set is
+            a global without synchronization: do not call this function while another thread calls ssw_init or
+            ssw_simd_level. ssw_init_simd and ssw_align do not read it.
+*/
+int8_t ssw_set_simd_level (int8_t level);
+
+#define SSW_SIMD_SSE2 0
+#define SSW_SIMD_AVX2 1
+#define SSW_SIMD_AVX512BW 2
+
+/* Reasons for function ssw_align to fail */
+#define SSW_ERROR_NONE 0
+#define SSW_ERROR_MEMORY 1      // memory could not be allocated
+#define SSW_ERROR_SCORE_SIZE 2  // the score overflowed the 8-bit profile and ssw_init built no 16-bit profile
+#define SSW_ERROR_PROFILE 3     // the profile holds neither an 8-bit nor a 16-bit profile
+#define SSW_ERROR_TRACEBACK 4   // the alignment path could not be traced back to the reported score
+
 #ifdef __cplusplus
 }
 #endif  // __cplusplus
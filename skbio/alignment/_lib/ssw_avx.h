@@ -0,0 +1,387 @@
+/*
+ *  ssw_avx.h
+ *
+ *  Wide-vector instantiation of the striped Smith-Waterman kernels in ssw.c.
+ *
+ *  This file is included by ssw.c once per instruction set, with the
+ *  following macros defined:
+ *
+ *    SSW_FN(name)   name of the instantiated function (e.g. name##_avx2)
+ *    SSW_TARGET     function attribute enabling the instruction set
+ *    SSW_VEC        vector type
+ *    SSW_BYTES      number of bytes in SSW_VEC
+ *    SSW_LOG2_BYTES base-2 logarithm of SSW_BYTES
+ *    vZERO() vSET8(x) vSET16(x) vLOAD(p) vSTORE(p, v) vAND(a, b)
+ *    vADDS8 vSUBS8 vMAX8 vADDS16 vSUBS16 vMAX16
+ *    vSHL8(v) vSHL16(v)          shift the whole vector left by one lane
+ *    vEQ8(a, b) vEQ16(a, b)      non-zero if all lanes are equal
+ *    vANYGT16(a, b)              non-zero if any signed 16-bit lane of a > b
+ *    vHMAX8(v) vHMAX16(v)        horizontal maximum
+ *    vCARRY8(v, d)               lane i of the result is the maximum over
+ *                                k < i of v[k] - (i - 1 - k) * segLen * gapE,
+ *                                given d[s] = (segLen * gapE) << s for
+ *                                s < SSW_LOG2_BYTES (saturated at 255)
+ *
+ *  The kernels are line-by-line ports of sw_sse2_byte and sw_sse2_word with
+ *  the number of lanes taken from SSW_BYTES. Wider vectors pad the query with
+ *  more rows than the SSE2 kernels do; padding rows carry scores along the
+ *  diagonal, so rows beyond those the SSE2 kernels compute are masked out of
+ *  the column maxima to produce the same results. Unlike the SSE2 kernels,
+ *  they return 0 when memory cannot be allocated.
+ */
+
+/* Lane masks selecting, per segment, the query rows below rows. */
+static SSW_TARGET SSW_VEC* SSW_FN(row_mask) (int32_t segLen, int32_t lanes, int32_t rows) {
+    SSW_VEC* pvMask = (SSW_VEC*) ssw_calloc_aligned(segLen, sizeof(SSW_VEC));
+    if (!pvMask) return 0;
+    int32_t width = SSW_BYTES / lanes, j, k;
+    for (j = 0; j < segLen; ++j)
+        for (k = 0; k < lanes; ++k)
+            if (k * segLen + j < rows) memset((uint8_t*)(pvMask + j) + k * width, 0xff, width);
+    return pvMask;
+}
+
+static SSW_TARGET alignment_end* SSW_FN(sw_byte) (const int8_t* ref,
+                                                  int8_t ref_dir,
+                                                  int32_t refLen,
+                                                  int32_t readLen,
+                                                  const uint8_t weight_gapO,
+                                                  const uint8_t weight_gapE,
+                                                  const SSW_VEC* vProfile,
+                                                  uint8_t terminate,
+                                                  uint8_t bias,
+                                                  int32_t maskLen) {
+
+    uint8_t max = 0;
+    int32_t end_read = readLen - 1;
+    int32_t end_ref = -1;
+    int32_t segLen = (readLen + SSW_BYTES - 1) / SSW_BYTES;
+    uint8_t* maxColumn = (uint8_t*) calloc(refLen, 1);
+
+    SSW_VEC vZero = vZERO();
+    SSW_VEC* pvHStore = (SSW_VEC*) ssw_calloc_aligned(segLen, sizeof(SSW_VEC));
+    SSW_VEC* pvHLoad = (SSW_VEC*) ssw_calloc_aligned(segLen, sizeof(SSW_VEC));
+    SSW_VEC* pvE = (SSW_VEC*) ssw_calloc_aligned(segLen, sizeof(SSW_VEC));
+    SSW_VEC* pvHmax = (SSW_VEC*) ssw_calloc_aligned(segLen, sizeof(SSW_VEC));
+    SSW_VEC* pvMask = SSW_FN(row_mask)(segLen, SSW_BYTES, (readLen + 15) / 16 * 16);
+
+    if (!maxColumn || !pvHStore || !pvHLoad || !pvE || !pvHmax || !pvMask) {
+        free(pvMask);
+        free(pvHmax);
+        free(pvE);
+        free(pvHLoad);
+        free(pvHStore);
+        free(maxColumn);
+        return 0;
+    }
+
+    int32_t i, j;
+    SSW_VEC vGapO = vSET8(weight_gapO);
+    SSW_VEC vGapE = vSET8(weight_gapE);
+    SSW_VEC vBias = vSET8(bias);
+    SSW_VEC vMaxScore = vZero;
+    SSW_VEC vMaxMark = vZero;
+    SSW_VEC vTemp;
+    SSW_VEC vDecay[SSW_LOG2_BYTES];
+    int32_t edge, begin = 0, end = refLen, step = 1;
+
+    /* With few segments per lane, Lazy_F keeps wrapping around the lanes on similar sequences. There, carry F across
+       lanes with a prefix scan and apply it in a single pass instead; both give the same H. With one or two segments
+       the scan does not pay off, and with many segments Lazy_F rarely gets past the first few. */
+    int32_t scan = segLen >= 4 && segLen <= 16;
+    for (j = 0; j < SSW_LOG2_BYTES; ++j) {
+        int32_t decay = (segLen * weight_gapE) << j;
+        vDecay[j] = vSET8(decay > 255 ? 255 : decay);
+    }
+
+    if (ref_dir == 1) {
+        begin = refLen - 1;
+        end = -1;
+        step = -1;
+    }
+    for (i = begin; LIKELY(i != end); i += step) {
+        SSW_VEC e, vF = vZero, vMaxColumn = vZero;
+        SSW_VEC vH = vSHL8(pvHStore[segLen - 1]);
+        const SSW_VEC* vP = vProfile + ref[i] * segLen;
+
+        SSW_VEC* pv = pvHLoad;
+        pvHLoad = pvHStore;
+        pvHStore = pv;
+
+        for (j = 0; LIKELY(j < segLen); ++j) {
+            vH = vADDS8(vH, vLOAD(vP + j));
+            vH = vSUBS8(vH, vBias);
+
+            e = vLOAD(pvE + j);
+            vH = vMAX8(vH, e);
+            vH = vMAX8(vH, vF);
+            vMaxColumn = vMAX8(vMaxColumn, vAND(vH, vLOAD(pvMask + j)));
+
+            vSTORE(pvHStore + j, vH);
+
+            vH = vSUBS8(vH, vGapO);
+            e = vSUBS8(e, vGapE);
+            e = vMAX8(e, vH);
+            vSTORE(pvE + j, e);
+
+            vF = vSUBS8(vF, vGapE);
+            vF = vMAX8(vF, vH);
+
+            vH = vLOAD(pvHLoad + j);
+        }
+
+        if (scan) {
+            /* F entering each lane from all preceding lanes */
+            vF = vCARRY8(vF, vDecay);
+            for (j = 0; LIKELY(j < segLen); ++j) {
+                vH = vMAX8(vLOAD(pvHStore + j), vF);
+                vMaxColumn = vMAX8(vMaxColumn, vAND(vH, vLOAD(pvMask + j)));
+                vSTORE(pvHStore + j, vH);
+                vF = vSUBS8(vF, vGapE);
+            }
+        } else {
+            /* Lazy_F loop */
+            j = 0;
+            vH = vLOAD(pvHStore + j);
+            vF = vSHL8(vF);
+            vTemp = vSUBS8(vH, vGapO);
+            vTemp = vSUBS8(vF, vTemp);
+
+            while (!vEQ8(vTemp, vZero)) {
+                vH = vMAX8(vH, vF);
+                vMaxColumn = vMAX8(vMaxColumn, vAND(vH, vLOAD(pvMask + j)));
+                vSTORE(pvHStore + j, vH);
+                vF = vSUBS8(vF, vGapE);
+                j++;
+                if (j >= segLen) {
+                    j = 0;
+                    vF = vSHL8(vF);
+                }
+                vH = vLOAD(pvHStore + j);
+
+                vTemp = vSUBS8(vH, vGapO);
+                vTemp = vSUBS8(vF, vTemp);
+            }
+        }
+
+        vMaxScore = vMAX8(vMaxScore, vMaxColumn);
+        if (!vEQ8(vMaxMark, vMaxScore)) {
+            uint8_t temp = vHMAX8(vMaxScore);
+            vMaxMark = vMaxScore;
+
+            if (LIKELY(temp > max)) {
+                max = temp;
+                if (max + bias >= 255) break;   //overflow
+                end_ref = i;
+                for (j = 0; LIKELY(j < segLen); ++j) pvHmax[j] = pvHStore[j];
+            }
+        }
+
+        maxColumn[i] = vHMAX8(vMaxColumn);
+        if (maxColumn[i] == terminate) break;
+    }
+
+    /* Trace the alignment ending position on read. */
+    uint8_t *t = (uint8_t*)pvHmax;
+    int32_t column_len = segLen * SSW_BYTES;
+    for (i = 0; LIKELY(i < column_len); ++i, ++t) {
+        int32_t temp;
+        if (*t == max) {
+            temp = i / SSW_BYTES + i % SSW_BYTES * segLen;
+            if (temp < end_read) end_read = temp;
+        }
+    }
+
+    free(pvMask);
+    free(pvHmax);
+    free(pvE);
+    free(pvHLoad);
+    free(pvHStore);
+
+    /* Find the most possible 2nd best alignment. */
+    alignment_end* bests = (alignment_end*) calloc(2, sizeof(alignment_end));
+    if (!bests) {
+        free(maxColumn);
+        return 0;
+    }
+    bests[0].score = max + bias >= 255 ? 255 : max;
+    bests[0].ref = end_ref;
+    bests[0].read = end_read;
+
+    bests[1].score = 0;
+    bests[1].ref = 0;
+    bests[1].read = 0;
+
+    edge = (end_ref - maskLen) > 0 ? (end_ref - maskLen) : 0;
+    for (i = 0; i < edge; i ++) {
+        if (maxColumn[i] > bests[1].score) {
+            bests[1].score = maxColumn[i];
+            bests[1].ref = i;
+        }
+    }
+    edge = (end_ref + maskLen) > refLen ? refLen : (end_ref + maskLen);
+    for (i = edge + 1; i < refLen; i ++) {
+        if (maxColumn[i] > bests[1].score) {
+            bests[1].score = maxColumn[i];
+            bests[1].ref = i;
+        }
+    }
+
+    free(maxColumn);
+    return bests;
+}
+
+static SSW_TARGET alignment_end* SSW_FN(sw_word) (const int8_t* ref,
+                                                  int8_t ref_dir,
+                                                  int32_t refLen,
+                                                  int32_t readLen,
+                                                  const uint8_t weight_gapO,
+                                                  const uint8_t weight_gapE,
+                                                  const SSW_VEC* vProfile,
+                                                  uint16_t terminate,
+                                                  int32_t maskLen) {
+
+    uint16_t max = 0;
+    int32_t end_read = readLen - 1;
+    int32_t end_ref = 0;
+    int32_t segLen = (readLen + SSW_BYTES / 2 - 1) / (SSW_BYTES / 2);
+    uint16_t* maxColumn = (uint16_t*) calloc(refLen, 2);
+
+    SSW_VEC vZero = vZERO();
+    SSW_VEC* pvHStore = (SSW_VEC*) ssw_calloc_aligned(segLen, sizeof(SSW_VEC));
+    SSW_VEC* pvHLoad = (SSW_VEC*) ssw_calloc_aligned(segLen, sizeof(SSW_VEC));
+    SSW_VEC* pvE = (SSW_VEC*) ssw_calloc_aligned(segLen, sizeof(SSW_VEC));
+    SSW_VEC* pvHmax = (SSW_VEC*) ssw_calloc_aligned(segLen, sizeof(SSW_VEC));
+    SSW_VEC* pvMask = SSW_FN(row_mask)(segLen, SSW_BYTES / 2, (readLen + 7) / 8 * 8);
+
+    if (!maxColumn || !pvHStore || !pvHLoad || !pvE || !pvHmax || !pvMask) {
+        free(pvMask);
+        free(pvHmax);
+        free(pvE);
+        free(pvHLoad);
+        free(pvHStore);
+        free(maxColumn);
+        return 0;
+    }
+
+    int32_t i, j, k;
+    SSW_VEC vGapO = vSET16(weight_gapO);
+    SSW_VEC vGapE = vSET16(weight_gapE);
+    SSW_VEC vMaxScore = vZero;
+    SSW_VEC vMaxMark = vZero;
+    int32_t edge, begin = 0, end = refLen, step = 1;
+
+    if (ref_dir == 1) {
+        begin = refLen - 1;
+        end = -1;
+        step = -1;
+    }
+    for (i = begin; LIKELY(i != end); i += step) {
+        SSW_VEC e, vF = vZero, vMaxColumn = vZero;
+        SSW_VEC vH = vSHL16(pvHStore[segLen - 1]);
+        const SSW_VEC* vP = vProfile + ref[i] * segLen;
+
+        SSW_VEC* pv = pvHLoad;
+        pvHLoad = pvHStore;
+        pvHStore = pv;
+
+        for (j = 0; LIKELY(j < segLen); j ++) {
+            vH = vADDS16(vH, vLOAD(vP + j));
+
+            e = vLOAD(pvE + j);
+            vH = vMAX16(vH, e);
+            vH = vMAX16(vH, vF);
+            vMaxColumn = vMAX16(vMaxColumn, vAND(vH, vLOAD(pvMask + j)));
+
+            vSTORE(pvHStore + j, vH);
+
+            vH = vSUBS16(vH, vGapO);
+            e = vSUBS16(e, vGapE);
+            e = vMAX16(e, vH);
+            vSTORE(pvE + j, e);
+
+            vF = vSUBS16(vF, vGapE);
+            vF = vMAX16(vF, vH);
+
+            vH = vLOAD(pvHLoad + j);
+        }
+
+        /* Lazy_F loop */
+        for (k = 0; LIKELY(k < SSW_BYTES / 2); ++k) {
+            vF = vSHL16(vF);
+            for (j = 0; LIKELY(j < segLen); ++j) {
+                vH = vLOAD(pvHStore + j);
+                vH = vMAX16(vH, vF);
+                vSTORE(pvHStore + j, vH);
+                vH = vSUBS16(vH, vGapO);
+                vF = vSUBS16(vF, vGapE);
+                if (UNLIKELY(!vANYGT16(vF, vH))) goto end;
+            }
+        }
+
+end:
+        vMaxScore = vMAX16(vMaxScore, vMaxColumn);
+        if (!vEQ16(vMaxMark, vMaxScore)) {
+            uint16_t temp = vHMAX16(vMaxScore);
+            vMaxMark = vMaxScore;
+
+            if (LIKELY(temp > max)) {
+                max = temp;
+                end_ref = i;
+                for (j = 0; LIKELY(j < segLen); ++j) pvHmax[j] = pvHStore[j];
+            }
+        }
+
+        maxColumn[i] = vHMAX16(vMaxColumn);
+        if (maxColumn[i] == terminate) break;
+    }
+
+    /* Trace the alignment ending position on read. */
+    uint16_t *t = (uint16_t*)pvHmax;
+    int32_t column_len = segLen * (SSW_BYTES / 2);
+    for (i = 0; LIKELY(i < column_len); ++i, ++t) {
+        int32_t temp;
+        if (*t == max) {
+            temp = i / (SSW_BYTES / 2) + i % (SSW_BYTES / 2) * segLen;
+            if (temp < end_read) end_read = temp;
+        }
+    }
+
+    free(pvMask);
+    free(pvHmax);
+    free(pvE);
+    free(pvHLoad);
+    free(pvHStore);
+
+    /* Find the most possible 2nd best alignment. */
+    alignment_end* bests = (alignment_end*) calloc(2, sizeof(alignment_end));
+    if (!bests) {
+        free(maxColumn);
+        return 0;
+    }
+    bests[0].score = max;
+    bests[0].ref = end_ref;
+    bests[0].read = end_read;
+
+    bests[1].score = 0;
+    bests[1].ref = 0;
+    bests[1].read = 0;
+
+    edge = (end_ref - maskLen) > 0 ? (end_ref - maskLen) : 0;
+    for (i = 0; i < edge; i ++) {
+        if (maxColumn[i] > bests[1].score) {
+            bests[1].score = maxColumn[i];
+            bests[1].ref = i;
+        }
+    }
+    edge = (end_ref + maskLen) > refLen ? refLen : (end_ref + maskLen);
+    for (i = edge; i < refLen; i ++) {
+        if (maxColumn[i] > bests[1].score) {
+            bests[1].score = maxColumn[i];
+            bests[1].ref = i;
+        }
+    }
+
+    free(maxColumn);
+    return bests;
+}
@@ -12,7 +12,7 @@ from skbio.metadata._repr import _MetadataReprBuilder
 
 class _TabularMSAReprBuilder(_MetadataReprBuilder):
     def __init__(self, msa, width, indent):
-        super(_TabularMSAReprBuilder, self).__init__(msa, width, indent)
+        super().__init__(msa, width, indent)
         self._ellipse_insert = " ... "
 
     def _process_header(self):
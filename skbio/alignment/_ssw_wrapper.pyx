@@ -11,7 +11,7 @@ import numpy as np
 cimport numpy as cnp
 from skbio.sequence import Protein, Sequence
 
-cdef extern from "_lib/ssw.h":
+cdef extern from "_lib/ssw.h" nogil:
 
     ctypedef struct s_align:
         cnp.uint16_t score1
@@ -27,11 +27,12 @@ cdef extern from "_lib/ssw.h":
     ctypedef struct s_profile:
         pass
 
-    cdef s_profile* ssw_init(const cnp.int8_t* read,
-                             const cnp.int32_t readLen,
-                             const cnp.int8_t* mat,
-                             const cnp.int32_t n,
-                             const cnp.int8_t score_size)
+    cdef s_profile* ssw_init_simd(const cnp.int8_t* read,
+                                  const cnp.int32_t readLen,
+                                  const cnp.int8_t* mat,
+                                  const cnp.int32_t n,
+                                  const cnp.int8_t score_size,
+                                  const cnp.int8_t simd)
 
     cdef void init_destroy(s_profile* p)
 
@@ -43,10 +44,74 @@ cdef extern from "_lib/ssw.h":
                             const cnp.uint8_t flag,
                             const cnp.uint16_t filters,
                             const cnp.int32_t filterd,
-                            const cnp.int32_t maskLen)
+                            const cnp.int32_t maskLen,
+                            cnp.int8_t* error)
 
     cdef void align_destroy(s_align* a)
 
+    cdef cnp.int8_t ssw_simd_level()
+
+    cdef cnp.int8_t ssw_set_simd_level(cnp.int8_t level)
+
+    cdef cnp.int8_t SSW_SIMD_SSE2
+    cdef cnp.int8_t SSW_SIMD_AVX2
+    cdef cnp.int8_t SSW_SIMD_AVX512BW
+
+    cdef cnp.int8_t SSW_ERROR_MEMORY
+    cdef cnp.int8_t SSW_ERROR_SCORE_SIZE
+
+_simd_levels = {'sse2': SSW_SIMD_SSE2,
+                'avx2': SSW_SIMD_AVX2,
+                'avx512bw': SSW_SIMD_AVX512BW}
+_simd_names = {v: k for k, v in _simd_levels.items()}
+
+
+def _get_simd_level():
+    """Return the SIMD instruction set used by new aligners.
+
+    The widest instruction set supported by the running CPU is detected on
+    first use. ``'sse2'`` is also reported on non-x86 platforms, where it is
+    emulated through SIMDe.
+
+    Returns
+    -------
+    str
+        One of ``'sse2'``, ``'avx2'`` or ``'avx512bw'``.
+
+    """
+    return _simd_names[ssw_simd_level()]
+
+
+def _set_simd_level(level):
+    """Set the SIMD instruction set used by new aligners.
+
+    Parameters
+    ----------
+    level : str
+        One of ``'sse2'``, ``'avx2'`` or ``'avx512bw'``. It is lowered to the
+        widest instruction set supported by the running CPU.
+
+    Returns
+    -------
+    str
+        The instruction set that will be used.
+
+    Raises
+    ------
+    ValueError
+        If `level` is not a known instruction set.
+
+    Notes
+    -----
+    Existing ``StripedSmithWaterman`` objects keep the instruction set they
+    were created with.
+
+    """
+    if level not in _simd_levels:
+        raise ValueError("`level` must be one of %r, not %r"
+                         % (sorted(_simd_levels), level))
+    return _simd_names[ssw_set_simd_level(_simd_levels[level])]
+
 np_aa_table = np.array([
     23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23,
     23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23, 23,
@@ -595,16 +660,25 @@ cdef class StripedSmithWaterman:
 
         cdef cnp.int8_t s_size
         s_size = score_size
+        # Skip the 16-bit profile if even a perfect match of the whole query
+        # cannot saturate the 8-bit kernels (score plus bias must stay < 255).
+        if s_size == 2 and (read_length * max(int(matrix.max()), 0) -
+                            min(int(matrix.min()), 0)) < 255:
+            s_size = 0
 
         cdef cnp.int32_t m_width
         m_width = 24 if self.is_protein else 5
 
-        cdef s_profile* p
-        self.profile = ssw_init(<cnp.int8_t*> read_seq.data,
-                                read_length,
-                                <cnp.int8_t*> matrix.data,
-                                m_width,
-                                s_size)
+        cdef cnp.int8_t* read_data = <cnp.int8_t*> read_seq.data
+        cdef cnp.int8_t* matrix_data = <cnp.int8_t*> matrix.data
+        # The instruction set is a C global that _set_simd_level writes, so
+        # it is only read while holding the GIL.
+        cdef cnp.int8_t simd = ssw_simd_level()
+        with nogil:
+            self.profile = ssw_init_simd(read_data, read_length, matrix_data,
+                                         m_width, s_size, simd)
+        if self.profile is NULL:
+            raise MemoryError("Could not allocate the query profile.")
 
         # A hack to keep the python GC from eating our data
         self.__KEEP_IT_IN_SCOPE_read = read_seq
@@ -630,12 +704,28 @@ cdef class StripedSmithWaterman:
         cdef cnp.int32_t ref_length
         ref_length = len(reference_sequence)
 
+        # The profile is only read during alignment, so several threads can
+        # align against the same query at once.
         cdef s_align *align
-        align = ssw_align(self.profile, <cnp.int8_t*> reference.data,
-                          ref_length, self.gap_open_penalty,
-                          self.gap_extend_penalty, self.bit_flag,
-                          self.score_filter, self.distance_filter,
-                          self.mask_length)
+        cdef cnp.int8_t error
+        cdef cnp.int8_t* reference_data = <cnp.int8_t*> reference.data
+        with nogil:
+            align = ssw_align(self.profile, reference_data, ref_length,
+                              self.gap_open_penalty, self.gap_extend_penalty,
+                              self.bit_flag, self.score_filter,
+                              self.distance_filter, self.mask_length,
+                              &error)
+        if align is NULL:
+            if error == SSW_ERROR_MEMORY:
+                raise MemoryError(
+                    "Could not allocate memory for the alignment.")
+            if error == SSW_ERROR_SCORE_SIZE:
+                raise ValueError(
+                    "The alignment score does not fit in 8 bits. Use a "
+                    "`score_size` of 1 or 2.")
+            raise RuntimeError(
+                "Could not trace back the alignment path for the optimal "
+                "alignment score.")
 
         # Cython won't let me do this correctly, so duplicate code ahoy:
         if self.suppress_sequences:
@@ -18,14 +18,18 @@ from skbio.metadata._mixin import MetadataMixin, PositionalMetadataMixin
 from skbio.sequence import Sequence
 from skbio.sequence._grammared_sequence import GrammaredSequence
 from skbio.util._decorator import classonlymethod, overrides
-from skbio.util._misc import resolve_key
+from skbio.util._misc import resolve_key, resolve_keys
 from skbio.alignment._indexing import TabularMSAILoc, TabularMSALoc
+from skbio.alignment._cutils import gap_counts_cy
 
 from skbio.alignment._repr import _TabularMSAReprBuilder
 
 
 _Shape = collections.namedtuple("Shape", ["sequence", "position"])
 
+# Whether each accepted `axis` value refers to the sequence axis.
+_SEQUENCE_AXES = {"sequence": True, 0: True, "position": False, 1: False}
+
 
 class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
     """Store a multiple sequence alignment in tabular (row/column) form.
@@ -780,6 +784,7 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         if minter is not None and index is not None:
             raise ValueError("Cannot use both `minter` and `index` at the same time.")
         self._seqs = pd.Series([], dtype=object)
+        self._packed = None
         self.extend(
             sequences,
             minter=minter,
@@ -955,7 +960,9 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         'AC-'
 
         """
-        return iter(self._seqs)
+        # Iterating over the Series' underlying object array avoids pandas'
+        # per-element overhead.
+        return iter(self._seqs.values)
 
     def __reversed__(self):
         """Iterate in reverse order over sequences in the MSA.
@@ -975,7 +982,9 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         'ACG'
 
         """
-        return reversed(self._seqs)
+        # Series does not define __reversed__, so reversed() would fall back
+        # to positional __getitem__ calls.
+        return reversed(self._seqs.values)
 
     def __str__(self):
         """Return string summary of this MSA."""
@@ -1047,6 +1056,17 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         if not PositionalMetadataMixin._eq_(self, other):
             return False
 
+        if self.shape != other.shape or self.dtype is not other.dtype:
+            return False
+
+        # Sequences are compared one at a time below, which is slow for large
+        # MSAs. Comparing their packed bytes first rejects MSAs whose
+        # characters differ in a single pass.
+        if len(self) and not np.array_equal(
+            self._packed_bytes(), other._packed_bytes()
+        ):
+            return False
+
         return self._seqs.equals(other._seqs)
 
     def __ne__(self, other):
@@ -1127,7 +1147,7 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         False
 
         """
-        seqs = (copy.deepcopy(seq, memo) for seq in self._seqs)
+        seqs = (copy.deepcopy(seq, memo) for seq in self._seqs.values)
         msa_copy = self._constructor_(sequences=seqs)
 
         msa_copy._metadata = MetadataMixin._deepcopy_(self, memo)
@@ -1135,6 +1155,19 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
 
         return msa_copy
 
+    def __getstate__(self):
+        # The packed bytes are a cache derived from the sequences, so they are
+        # not pickled.
+        state = self.__dict__.copy()
+        state["_packed"] = None
+        return state
+
+    def __setstate__(self, state):
+        # MSAs pickled before the packed bytes cache existed have no
+        # ``_packed`` attribute.
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_packed", None)
+
     def __getitem__(self, indexable):
         """Slice the MSA on either axis.
 
@@ -1195,9 +1228,9 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
 
     def _get_position_(self, i, ignore_metadata=False):
         if ignore_metadata:
-            return Sequence("".join([str(s[i]) for s in self._seqs]))
+            return Sequence("".join([str(s[i]) for s in self._seqs.values]))
 
-        seq = Sequence.concat([s[i] for s in self._seqs], how="outer")
+        seq = Sequence.concat([s[i] for s in self._seqs.values], how="outer")
         # TODO: change for #1198
         if len(self) and self.has_positional_metadata():
             seq.metadata = dict(self.positional_metadata.iloc[i])
@@ -1394,24 +1427,30 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         position (``'-'``).
 
         """
-        dtype = self.dtype
-        if dtype is None:
-            dtype = Sequence
-
         positional_metadata = None
         if self.has_positional_metadata():
             positional_metadata = self.positional_metadata
 
+        dtype = self.dtype
+        if dtype is None:
+            # An MSA without a dtype has no sequences, and so no positions.
+            return Sequence("", positional_metadata=positional_metadata)
+
+        # These classproperties build a new object on every access, so look
+        # them up once rather than once per position.
+        gap_chars = dtype.gap_chars
+        default_gap_char = dtype.default_gap_char
+
         consensus = []
         for position in self.iter_positions(ignore_metadata=True):
             freqs = position.frequencies()
 
             gap_freq = 0
-            for gap_char in dtype.gap_chars:
+            for gap_char in gap_chars:
                 if gap_char in freqs:
                     gap_freq += freqs.pop(gap_char)
-            assert dtype.default_gap_char not in freqs
-            freqs[dtype.default_gap_char] = gap_freq
+            assert default_gap_char not in freqs
+            freqs[default_gap_char] = gap_freq
 
             consensus.append(collections.Counter(freqs).most_common(1)[0][0])
 
@@ -1623,28 +1662,35 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
 
         """
         if self._is_sequence_axis(axis):
-            seq_iterator = self.iter_positions(ignore_metadata=True)
+            reduce_axis = 0
             length = self.shape.sequence
         else:
-            seq_iterator = self
+            reduce_axis = 1
             length = self.shape.position
 
-        gap_freqs = []
-        for seq in seq_iterator:
-            # Not using Sequence.frequencies(relative=relative) because each
-            # gap character's relative frequency is computed separately and
-            # must be summed. This is less precise than summing the absolute
-            # frequencies of gap characters and dividing by the length. Likely
-            # not a big deal for typical gap characters ('-', '.') but can be
-            # problematic as the number of gap characters grows (we aren't
-            # guaranteed to always have two gap characters). See unit tests for
-            # an example.
-            freqs = seq.frequencies(chars=self.dtype.gap_chars)
-            gap_freqs.append(sum(freqs.values()))
-
-        gap_freqs = np.asarray(gap_freqs, dtype=float if relative else int)
+        if len(self) == 0:
+            gap_freqs = np.zeros(0, dtype=int)
+        else:
+            # Use the sequences' bytes as a single 2D array so that gap
+            # characters can be flagged for the whole MSA at once and counted
+            # with one reduction, for either axis. Absolute counts are summed
+            # before dividing, which is more precise than summing each gap
+            # character's relative frequency (we aren't guaranteed to always
+            # have two gap characters). See unit tests for an example.
+            packed = self._packed_bytes()
+            gap_codes = self.dtype._gap_codes
+            if len(gap_codes) <= 4:
+                # Count matches directly in compiled code for the usual one
+                # or two gap characters, without allocating a mask.
+                counts = np.empty(packed.shape[1 - reduce_axis], dtype=np.intp)
+                gap_counts_cy(packed, gap_codes, counts, reduce_axis == 0)
+                gap_freqs = counts.astype(int, copy=False)
+            else:
+                is_gap = self.dtype._gap_hash.take(packed)
+                gap_freqs = is_gap.sum(axis=reduce_axis, dtype=int)
 
         if relative:
+            gap_freqs = gap_freqs.astype(float)
             gap_freqs /= length
 
         return gap_freqs
@@ -1725,7 +1771,7 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
                     % type(mapping).__name__
                 )
         elif minter is not None:
-            self.index = [resolve_key(seq, minter) for seq in self._seqs]
+            self.index = resolve_keys(self._seqs, minter)
         else:
             del self.index
 
@@ -1826,9 +1872,40 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         RangeIndex(start=0, stop=3, step=1)
 
         """
-        if index is not None:
-            index = [index]
-        self.extend([sequence], minter=minter, index=index, reset_index=reset_index)
+        if not len(self):
+            # Appending to an empty MSA may change its number of positions,
+            # which extend handles.
+            if index is not None:
+                index = [index]
+            self.extend(
+                [sequence], minter=minter, index=index, reset_index=reset_index
+            )
+            return
+
+        # Specialized for a single sequence: validated on its own against the
+        # MSA's dtype and number of positions, then placed after the existing
+        # sequences without building and concatenating a second Series.
+        self._assert_one_index_option(minter, index, reset_index)
+        self._assert_valid_sequences([sequence])
+
+        n = len(self)
+        if minter is not None:
+            # Convert to Index to identify tuples as a MultiIndex instead of an
+            # index of tuples.
+            new_index = self._seqs.index.append(
+                pd.Index([resolve_key(sequence, minter)])
+            )
+        elif index is not None:
+            new_index = self._seqs.index.append(pd.Index([index]))
+        else:
+            new_index = pd.RangeIndex(start=0, stop=n + 1, step=1)
+
+        values = np.empty(n + 1, dtype=object)
+        values[:n] = self._seqs.values
+        values[n] = sequence
+
+        self._packed = None
+        self._seqs = pd.Series(values, index=new_index, copy=False)
 
     def extend(self, sequences, minter=None, index=None, reset_index=False):
         """Extend this MSA with sequences without recomputing alignment.
@@ -1937,11 +2014,7 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         RangeIndex(start=0, stop=6, step=1)
 
         """
-        if sum([minter is not None, index is not None, bool(reset_index)]) != 1:
-            raise ValueError(
-                "Must provide exactly one of the following parameters: "
-                "`minter`, `index`, `reset_index`"
-            )
+        self._assert_one_index_option(minter, index, reset_index)
 
         # Verify `sequences` first because `minter` could interact with each
         # sequence's `metadata`.
@@ -1951,7 +2024,7 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         if minter is not None:
             # Convert to Index to identify tuples as a MultiIndex instead of an
             # index of tuples.
-            index = pd.Index([resolve_key(seq, minter) for seq in sequences])
+            index = pd.Index(resolve_keys(sequences, minter))
         elif index is not None:
             # Convert to Index to identify tuples as a MultiIndex instead of an
             # index of tuples.
@@ -1975,6 +2048,7 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
                 start=len(self), stop=len(self) + len(sequences), step=1
             )
 
+        self._packed = None
         if len(self):
             self._seqs = pd.concat(
                 [self._seqs, pd.Series(sequences, index=index, dtype=object)]
@@ -1999,6 +2073,13 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         if reset_index:
             self.reassign_index()
 
+    def _assert_one_index_option(self, minter, index, reset_index):
+        if sum([minter is not None, index is not None, bool(reset_index)]) != 1:
+            raise ValueError(
+                "Must provide exactly one of the following parameters: "
+                "`minter`, `index`, `reset_index`"
+            )
+
     def _assert_valid_sequences(self, sequences):
         if not sequences:
             return
@@ -2426,8 +2507,38 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         modified (a new object is *not* returned).
 
         """
-        self._seqs.sort_index(ascending=ascending, level=level, inplace=True)
-        self.positional_metadata.sort_index(axis=1, inplace=True)
+        index = self.index
+        if level is None:
+            # Detect labels that are already in (or exactly opposite to) the
+            # requested order with a scan, which pandas caches on the index. A
+            # MultiIndex is compared lexicographically across all of its
+            # levels, matching the order sort_index produces. Reversal is only
+            # safe when labels are unique, otherwise ties would be reordered.
+            if ascending:
+                in_order = index.is_monotonic_increasing
+                reversed_order = index.is_monotonic_decreasing
+            else:
+                in_order = index.is_monotonic_decreasing
+                reversed_order = index.is_monotonic_increasing
+            reversed_order = (
+                reversed_order
+                and index.is_unique
+                and not isinstance(index, pd.RangeIndex)
+            )
+        else:
+            in_order = reversed_order = False
+
+        if reversed_order:
+            self._seqs = self._seqs.iloc[::-1]
+            if self._packed is not None:
+                packed = np.ascontiguousarray(self._packed[::-1])
+                packed.flags.writeable = False
+                self._packed = packed
+        elif not in_order:
+            self._seqs.sort_index(ascending=ascending, level=level, inplace=True)
+            self._packed = None
+        if self.has_positional_metadata():
+            self.positional_metadata.sort_index(axis=1, inplace=True)
 
     def to_dict(self):
         """Create a ``dict`` from this ``TabularMSA``.
@@ -2464,15 +2575,37 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
         else:
             raise ValueError("Cannot convert to dict. Index labels are not" " unique.")
 
+    def _packed_bytes(self):
+        """Return the sequences' bytes as a read-only, C-contiguous 2D uint8 array.
+
+        Rows are sequences and columns are positions. The array is built on
+        first use and cached until the sequences are extended or reordered.
+
+        """
+        if self._packed is None:
+            if len(self):
+                # Sequence bytes are always C-contiguous, so they can be
+                # joined into the final buffer in a single copy. This avoids
+                # np.vstack's per-row overhead, which dominates for many short
+                # sequences.
+                packed = np.frombuffer(
+                    b"".join([seq._bytes for seq in self._seqs.values]),
+                    dtype=np.uint8,
+                ).reshape(self.shape)
+            else:
+                packed = np.empty((0, 0), dtype=np.uint8)
+            packed.flags.writeable = False
+            self._packed = packed
+        return self._packed
+
     def _is_sequence_axis(self, axis):
-        if axis == "sequence" or axis == 0:
-            return True
-        elif axis == "position" or axis == 1:
-            return False
-        else:
+        try:
+            return _SEQUENCE_AXES[axis]
+        except (KeyError, TypeError):
+            # TypeError is raised for unhashable `axis`
             raise ValueError(
                 "`axis` must be 'sequence' (0) or 'position' (1), not %r" % axis
-            )
+            ) from None
 
     @overrides(PositionalMetadataMixin)
     def _positional_metadata_axis_len_(self):
@@ -16,11 +16,15 @@
 # the resulting alignments are verified by hand. Creating tests from the base
 # C API is impractical at this time.
 
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, main
 
+import numpy as np
+
 from skbio import (local_pairwise_align_ssw, Sequence, DNA, RNA, Protein,
                    SubstitutionMatrix, TabularMSA)
 from skbio.alignment import StripedSmithWaterman, AlignmentStructure
+from skbio.alignment._ssw_wrapper import _get_simd_level, _set_simd_level
 
 
 class TestSSW(TestCase):
@@ -214,6 +218,27 @@ class TestStripedSmithWaterman(TestSSW):
         alignment = query(expected['target_sequence'])
         self._check_alignment(alignment, expected)
 
+    def test_object_is_usable_from_threads(self):
+        query = StripedSmithWaterman("AGGGTAATTAGGCGTGTTCACCTA")
+        targets = ["AGTCGAAGGGTAATATAGGCGTGTCACCTA",
+                   "TTATAATTTTCTTATTATTATCAATATTTATAATTTGATTTTGTTGTAAT",
+                   "AGGGTAATTAGGCGTGTTCACCTA"] * 20
+        expected = [query(target) for target in targets]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            observed = list(executor.map(query, targets))
+        for obs, exp in zip(observed, expected):
+            for attribute in self.align_attributes:
+                self.assertEqual(obs[attribute], exp[attribute])
+
+    def test_score_near_8_bit_limit(self):
+        # With the default scores, 125 matches still fit the 8-bit kernels
+        # on their own; 126 matches need the 16-bit fallback.
+        for length in (125, 126, 127):
+            sequence = ('ACGT' * 32)[:length]
+            alignment = StripedSmithWaterman(sequence)(sequence)
+            self.assertEqual(alignment.optimal_alignment_score, 2 * length)
+            self.assertEqual(alignment.cigar, '%dM' % length)
+
     def test_protein_sequence_is_usable(self):
         expected = {
             'optimal_alignment_score': 316,
@@ -556,6 +581,27 @@ class TestStripedSmithWaterman(TestSSW):
         alignment = query("CGCGCGCCGCCGGGGGGCCGGCCGGCGCCGGGGGGCGCCCCGGGCGGGGC")
         self._check_alignment(alignment, expected)
 
+    def test_score_overflow_without_16_bit_profile(self):
+        query = StripedSmithWaterman("A" * 200, score_size=0)
+        with self.assertRaisesRegex(ValueError, 'score_size'):
+            query("A" * 200)
+
+    def test_traceback_failure(self):
+        # With a gap open penalty below the extension penalty, the striped
+        # score cannot be reached by the banded traceback.
+        query = StripedSmithWaterman("AGTGCTTCTGGTGTACTTACGGCTCG",
+                                     match_score=2, mismatch_score=-4,
+                                     gap_open_penalty=1, gap_extend_penalty=3)
+        with self.assertRaisesRegex(RuntimeError, 'trace back'):
+            query("ACCCCGACCGGCAGCTACAC")
+        # score-only alignments skip the traceback
+        query = StripedSmithWaterman("AGTGCTTCTGGTGTACTTACGGCTCG",
+                                     match_score=2, mismatch_score=-4,
+                                     gap_open_penalty=1, gap_extend_penalty=3,
+                                     score_only=True)
+        self.assertGreater(
+            query("ACCCCGACCGGCAGCTACAC").optimal_alignment_score, 0)
+
 
 class TestAlignStripedSmithWaterman(TestSSW):
 
@@ -768,5 +814,146 @@ class TestAlignmentStructure(TestSSW):
         self.assertEqual(None, alignment.aligned_query_sequence)
 
 
+class TestSIMDLevel(TestSSW):
+
+    def setUp(self):
+        self.level = _get_simd_level()
+
+    def tearDown(self):
+        _set_simd_level(self.level)
+
+    def test_get_simd_level(self):
+        self.assertIn(_get_simd_level(), ('sse2', 'avx2', 'avx512bw'))
+
+    def test_set_simd_level(self):
+        self.assertEqual(_set_simd_level('sse2'), 'sse2')
+        self.assertEqual(_get_simd_level(), 'sse2')
+
+    def test_set_simd_level_invalid(self):
+        with self.assertRaisesRegex(ValueError, 'avx3'):
+            _set_simd_level('avx3')
+
+    # Scoring settings for the indel cases: the defaults, gap open penalties
+    # equal to the extension penalty or below the mismatch penalty (which
+    # run on SSE2 at every level), and gap opens above both.
+    scorings = [
+        {},
+        {'match_score': 3, 'mismatch_score': -1,
+         'gap_open_penalty': 1, 'gap_extend_penalty': 1},
+        {'match_score': 4, 'mismatch_score': -1,
+         'gap_open_penalty': 2, 'gap_extend_penalty': 2},
+        {'match_score': 4, 'mismatch_score': -2,
+         'gap_open_penalty': 6, 'gap_extend_penalty': 1},
+        {'match_score': 3, 'mismatch_score': -3,
+         'gap_open_penalty': 4, 'gap_extend_penalty': 2},
+    ]
+
+    @staticmethod
+    def _mutate(rng, seq, rate):
+        """Substitute, delete and insert characters at a combined rate."""
+        out = []
+        for char in seq:
+            r = rng.rand()
+            if r < rate / 3:
+                out.append(rng.choice(list('ACGT')))
+            elif r < 2 * rate / 3:
+                continue
+            elif r < rate:
+                out.append(char)
+                out.extend(rng.choice(list('ACGT'), rng.randint(1, 6)))
+            else:
+                out.append(char)
+        return ''.join(out)
+
+    @staticmethod
+    def _reference_score(query, target, match_score=2, mismatch_score=-3,
+                         gap_open_penalty=5, gap_extend_penalty=2):
+        """Optimal local alignment score by Gotoh's algorithm.
+
+        As in SSW, a gap of length k costs
+        ``gap_open_penalty + (k - 1) * gap_extend_penalty``.
+
+        """
+        best = 0
+        h_row = [0] * (len(target) + 1)
+        f_row = [float('-inf')] * (len(target) + 1)
+        for q in query:
+            h_diag, h_left, e = 0, 0, float('-inf')
+            for j, t in enumerate(target, 1):
+                e = max(h_left - gap_open_penalty, e - gap_extend_penalty)
+                f_row[j] = max(h_row[j] - gap_open_penalty,
+                               f_row[j] - gap_extend_penalty)
+                score = match_score if q == t else mismatch_score
+                h = max(0, h_diag + score, e, f_row[j])
+                h_diag, h_row[j], h_left = h_row[j], h, h
+                best = max(best, h)
+        return best
+
+    def _indel_cases(self, lengths):
+        rng = np.random.RandomState(42)
+        cases = []
+        for length in lengths:
+            query = ''.join(rng.choice(list('ACGT'), length))
+            for rate in (0.1, 0.2, 0.3):
+                target = ''.join(rng.choice(list('ACGT'), 20)) + \
+                    self._mutate(rng, query, rate) + \
+                    ''.join(rng.choice(list('ACGT'), 20))
+                for kwargs in self.scorings:
+                    cases.append((query, target, kwargs))
+        return cases
+
+    def test_levels_give_same_alignments(self):
+        # Query lengths straddle multiples of the vector widths, and long
+        # queries overflow the 8-bit kernels.
+        rng = np.random.RandomState(42)
+        cases = []
+        for length in (1, 15, 17, 31, 33, 63, 65, 200, 600):
+            query = ''.join(rng.choice(list('ACGT'), length))
+            start = rng.randint(length)
+            target = ''.join(rng.choice(list('ACGT'), 40)) + \
+                query[start:] + ''.join(rng.choice(list('ACGT'), 80))
+            cases.append((query, target, {}))
+            cases.append((query, target, {'gap_open_penalty': 2,
+                                           'gap_extend_penalty': 1}))
+        for length in (20, 100):
+            query = ''.join(rng.choice(list('ACDEFGHIKLMNPQRSTVWY'), length))
+            cases.append((query, query[length // 3:] + query,
+                          {'protein': True,
+                           'substitution_matrix': self.blosum50}))
+            target = self._mutate(rng, query, 0.2).replace('G', 'W')
+            for gap_open_penalty in (3, 5, 11):
+                cases.append((query, target,
+                              {'protein': True,
+                               'substitution_matrix': self.blosum50,
+                               'gap_open_penalty': gap_open_penalty,
+                               'gap_extend_penalty': 1}))
+        # Targets with substitutions, insertions and deletions exercise the
+        # vertical gap (F) correction. The longer queries use the 16-bit
+        # kernels and the prefix scan in the 8-bit AVX2 kernel.
+        cases.extend(self._indel_cases(range(20, 320, 20)))
+
+        def align_all(level):
+            _set_simd_level(level)
+            return [StripedSmithWaterman(query, **kwargs)(target)
+                    for query, target, kwargs in cases]
+
+        expected = align_all('sse2')
+        for level in ('avx2', 'avx512bw'):
+            for obs, exp in zip(align_all(level), expected):
+                for attribute in self.align_attributes:
+                    self.assertEqual(obs[attribute], exp[attribute],
+                                     (level, exp.query_sequence, attribute))
+
+    def test_optimal_scores_match_reference(self):
+        cases = self._indel_cases(range(25, 130, 15))
+        expected = [self._reference_score(query, target, **kwargs)
+                    for query, target, kwargs in cases]
+        for level in ('sse2', 'avx2', 'avx512bw'):
+            _set_simd_level(level)
+            for (query, target, kwargs), exp in zip(cases, expected):
+                obs = StripedSmithWaterman(query, score_only=True, **kwargs)
+                self.assertEqual(obs(target).optimal_alignment_score, exp,
+                                 (level, query, target, kwargs))
+
 if __name__ == '__main__':
     main()
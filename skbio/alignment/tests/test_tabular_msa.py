@@ -11,6 +11,8 @@ import copy
 import unittest
 import functools
 import itertools
+import operator
+import pickle
 import types
 
 import numpy as np
@@ -36,8 +38,9 @@ class TabularMSASubclass(TabularMSA):
 
 class TestTabularMSAMetadata(unittest.TestCase, ReallyEqualMixin,
                              MetadataMixinTests):
-    def setUp(self):
-        self._metadata_constructor_ = functools.partial(TabularMSA, [])
+    @classmethod
+    def setUpClass(cls):
+        cls._metadata_constructor_ = functools.partial(TabularMSA, [])
 
 
 class TestTabularMSAPositionalMetadata(unittest.TestCase, ReallyEqualMixin,
@@ -50,6 +53,24 @@ class TestTabularMSAPositionalMetadata(unittest.TestCase, ReallyEqualMixin,
 
 
 class TestTabularMSA(unittest.TestCase, ReallyEqualMixin):
+    @classmethod
+    def setUpClass(cls):
+        # Only used by tests whose operations are expected to fail and leave
+        # the MSA untouched (which assertRaisesAndIndexPreserved verifies).
+        cls.minted_msa = TabularMSA([DNA('ACGT'), DNA('TGCA')], minter=str)
+        # Only compared, never mutated, by the equality tests.
+        cls.eq_and_ne_msas = [TabularMSA(seqs, **kwargs)
+                              for _, seqs, kwargs in
+                              cls._eq_and_ne_components()]
+
+    def assertRaisesAndIndexPreserved(self, msa, exc, regex, op, *args,
+                                      **kwargs):
+        # The index is immutable, so holding a reference is a snapshot.
+        before = msa.index
+        with self.assertRaisesRegex(exc, regex):
+            op(*args, **kwargs)
+        assert_index_equal(msa.index, before)
+
     def test_from_dict_empty(self):
         self.assertEqual(TabularMSA.from_dict({}), TabularMSA([], index=[]))
 
@@ -132,6 +153,11 @@ class TestTabularMSA(unittest.TestCase, ReallyEqualMixin):
                                     r'sequences.*2.*index length.*0'):
             TabularMSA([DNA('ACGT'), DNA('TGCA')], index=pd.Index([]))
 
+    def test_constructor_index_length_mismatch_tuple(self):
+        with self.assertRaisesRegex(ValueError,
+                                    r'sequences.*2.*index length.*0'):
+            TabularMSA((DNA('ACGT'), DNA('TGCA')), index=[])
+
     def test_constructor_invalid_index_scalar(self):
         with self.assertRaises(TypeError):
             TabularMSA([DNA('ACGT'), DNA('TGCA')], index=42)
@@ -342,14 +368,12 @@ class TestTabularMSA(unittest.TestCase, ReallyEqualMixin):
         assert_index_equal(msa.index, pd.RangeIndex(3))
 
         # immutable
-        with self.assertRaises(TypeError):
-            msa.index[1] = 2
-        # original state is maintained
-        assert_index_equal(msa.index, pd.RangeIndex(3))
+        self.assertRaisesAndIndexPreserved(msa, TypeError, r'mutable',
+                                           operator.setitem, msa.index, 1, 2)
 
     def test_index_getter(self):
         index = TabularMSA([DNA('AC'), DNA('AG'), DNA('AT')], minter=str).index
-        self.assertIsInstance(index, pd.Index)
+        # assert_index_equal is exact, so this also checks the index type
         assert_index_equal(index, pd.Index(['AC', 'AG', 'AT']))
 
         # immutable
@@ -377,15 +401,12 @@ class TestTabularMSA(unittest.TestCase, ReallyEqualMixin):
         assert_index_equal(msa.index, pd.RangeIndex(3, 6))
 
     def test_index_setter_length_mismatch(self):
-        msa = TabularMSA([DNA('ACGT'), DNA('TGCA')], minter=str)
-        index = pd.Index(['ACGT', 'TGCA'])
-        assert_index_equal(msa.index, index)
-
-        with self.assertRaisesRegex(ValueError, r'Length mismatch.*2.*3'):
-            msa.index = iter(['ab', 'cd', 'ef'])
+        msa = self.minted_msa
+        assert_index_equal(msa.index, pd.Index(['ACGT', 'TGCA']))
 
-        # original state is maintained
-        assert_index_equal(msa.index, index)
+        self.assertRaisesAndIndexPreserved(
+            msa, ValueError, r'Length mismatch.*2.*3',
+            setattr, msa, 'index', iter(['ab', 'cd', 'ef']))
 
     def test_index_setter_non_unique_index(self):
         msa = TabularMSA([RNA('UUU'), RNA('AAA')], minter=str)
@@ -445,10 +466,10 @@ class TestTabularMSA(unittest.TestCase, ReallyEqualMixin):
             next(iter(TabularMSA([])))
 
         seqs = [DNA(''), DNA('')]
-        self.assertEqual(list(iter(TabularMSA(seqs))), seqs)
+        self.assertEqual(list(TabularMSA(seqs)), seqs)
 
         seqs = [DNA('AAA'), DNA('GCT')]
-        self.assertEqual(list(iter(TabularMSA(seqs))), seqs)
+        self.assertEqual(list(TabularMSA(seqs)), seqs)
 
     def test_reversed(self):
         with self.assertRaises(StopIteration):
@@ -460,68 +481,109 @@ class TestTabularMSA(unittest.TestCase, ReallyEqualMixin):
         seqs = [DNA('AAA'), DNA('GCT')]
         self.assertEqual(list(reversed(TabularMSA(seqs))), seqs[::-1])
 
-    def test_eq_and_ne(self):
-        # Each element contains the components necessary to construct a
-        # TabularMSA object: seqs and kwargs. None of these objects (once
-        # constructed) should compare equal to one another.
-        components = [
-            # empties
-            ([], {}),
-            ([RNA('')], {}),
-            ([RNA('')], {'minter': str}),
-
-            # 1x1
-            ([RNA('U')], {'minter': str}),
-
-            # 2x3
-            ([RNA('AUG'), RNA('GUA')], {'minter': str}),
-
-            ([RNA('AG'), RNA('GG')], {}),
-            # has labels
-            ([RNA('AG'), RNA('GG')], {'minter': str}),
-            # different dtype
-            ([DNA('AG'), DNA('GG')], {'minter': str}),
-            # different labels
-            ([RNA('AG'), RNA('GG')], {'minter': lambda x: str(x) + '42'}),
-            # different sequence metadata
-            ([RNA('AG', metadata={'id': 42}), RNA('GG')], {'minter': str}),
-            # different sequence data, same labels
-            ([RNA('AG'), RNA('GA')],
+    @staticmethod
+    def _eq_and_ne_components():
+        # Each element contains a label for the kind of difference it covers
+        # and the components necessary to construct a TabularMSA object: seqs
+        # and kwargs. None of these objects (once constructed) should compare
+        # equal to one another.
+        return [
+            ('empty', [], {}),
+            ('empty', [RNA('')], {}),
+            ('empty', [RNA('')], {'minter': str}),
+            ('1x1', [RNA('U')], {'minter': str}),
+            ('2x3', [RNA('AUG'), RNA('GUA')], {'minter': str}),
+            ('2x2', [RNA('AG'), RNA('GG')], {}),
+            ('labels', [RNA('AG'), RNA('GG')], {'minter': str}),
+            ('dtype', [DNA('AG'), DNA('GG')], {'minter': str}),
+            ('labels', [RNA('AG'), RNA('GG')],
+             {'minter': lambda x: str(x) + '42'}),
+            ('sequence metadata', [RNA('AG', metadata={'id': 42}), RNA('GG')],
+             {'minter': str}),
+            # same labels as 'labels' above
+            ('sequence data', [RNA('AG'), RNA('GA')],
              {'minter': lambda x: 'AG' if 'AG' in x else 'GG'}),
-            # different MSA metadata
-            ([RNA('AG'), RNA('GG')], {'metadata': {'foo': 42}}),
-            ([RNA('AG'), RNA('GG')], {'metadata': {'foo': 43}}),
-            ([RNA('AG'), RNA('GG')], {'metadata': {'foo': 42, 'bar': 43}}),
-            # different MSA positional metadata
-            ([RNA('AG'), RNA('GG')],
+            ('MSA metadata', [RNA('AG'), RNA('GG')],
+             {'metadata': {'foo': 42}}),
+            ('MSA metadata', [RNA('AG'), RNA('GG')],
+             {'metadata': {'foo': 43}}),
+            ('MSA metadata', [RNA('AG'), RNA('GG')],
+             {'metadata': {'foo': 42, 'bar': 43}}),
+            ('positional metadata', [RNA('AG'), RNA('GG')],
              {'positional_metadata': {'foo': [42, 43]}}),
-            ([RNA('AG'), RNA('GG')],
+            ('positional metadata', [RNA('AG'), RNA('GG')],
              {'positional_metadata': {'foo': [43, 44]}}),
-            ([RNA('AG'), RNA('GG')],
+            ('positional metadata', [RNA('AG'), RNA('GG')],
              {'positional_metadata': {'foo': [42, 43], 'bar': [43, 44]}}),
         ]
 
-        for seqs, kwargs in components:
-            obj = TabularMSA(seqs, **kwargs)
-            self.assertReallyEqual(obj, obj)
-            self.assertReallyEqual(obj, TabularMSA(seqs, **kwargs))
-            self.assertReallyEqual(obj, TabularMSASubclass(seqs, **kwargs))
-
-        for (seqs1, kwargs1), (seqs2, kwargs2) in \
-                itertools.combinations(components, 2):
-            obj1 = TabularMSA(seqs1, **kwargs1)
-            obj2 = TabularMSA(seqs2, **kwargs2)
-            self.assertReallyNotEqual(obj1, obj2)
-            self.assertReallyNotEqual(obj1,
-                                      TabularMSASubclass(seqs2, **kwargs2))
-
-        # completely different types
+    def test_eq_self(self):
+        for i, obj in enumerate(self.eq_and_ne_msas):
+            with self.subTest(component=i):
+                self.assertReallyEqual(obj, obj)
+
+    def test_eq_reconstructed(self):
+        # the right-hand side is rebuilt so that equality is not identity
+        for i, ((_, seqs, kwargs), obj) in enumerate(
+                zip(self._eq_and_ne_components(), self.eq_and_ne_msas)):
+            with self.subTest(component=i):
+                self.assertReallyEqual(obj, TabularMSA(seqs, **kwargs))
+                self.assertReallyEqual(obj,
+                                       TabularMSASubclass(seqs, **kwargs))
+
+    def test_ne_pairwise(self):
+        for (i, obj1), (j, obj2) in \
+                itertools.combinations(enumerate(self.eq_and_ne_msas), 2):
+            with self.subTest(components=(i, j)):
+                self.assertReallyNotEqual(obj1, obj2)
+
+    def test_ne_subclass_cross_type(self):
+        # Subclass equality does not depend on which attribute differs, so
+        # the first component of each kind is enough.
+        representatives = {}
+        for (kind, seqs, kwargs), msa in zip(self._eq_and_ne_components(),
+                                             self.eq_and_ne_msas):
+            representatives.setdefault(kind, (seqs, kwargs, msa))
+        for kind1, kind2 in itertools.permutations(representatives, 2):
+            with self.subTest(kinds=(kind1, kind2)):
+                msa = representatives[kind1][2]
+                seqs, kwargs, _ = representatives[kind2]
+                self.assertReallyNotEqual(msa,
+                                          TabularMSASubclass(seqs, **kwargs))
+
+    def test_ne_different_types(self):
         msa = TabularMSA([])
         self.assertReallyNotEqual(msa, 42)
         self.assertReallyNotEqual(msa, [])
         self.assertReallyNotEqual(msa, {})
         self.assertReallyNotEqual(msa, '')
 
+    def test_eq_after_mutation(self):
+        # comparisons cache each MSA's packed bytes, which must not outlive
+        # changes to its sequences
+        msa1 = TabularMSA([DNA('AC'), DNA('G-')], index=['a', 'b'])
+        msa2 = TabularMSA([DNA('AC'), DNA('G-')], index=['a', 'b'])
+        self.assertReallyEqual(msa1, msa2)
+
+        msa2.sort(ascending=False)
+        self.assertReallyNotEqual(msa1, msa2)
+        msa2.sort()
+        self.assertReallyEqual(msa1, msa2)
+
+        msa2.append(DNA('TT'), index='c')
+        self.assertReallyNotEqual(msa1, msa2)
+        msa1.append(DNA('TT'), index='c')
+        self.assertReallyEqual(msa1, msa2)
+
+        msa2.extend([DNA('--')], index=['d'])
+        msa1.extend([DNA('-.')], index=['d'])
+        self.assertReallyNotEqual(msa1, msa2)
+
+    def test_ne_same_bytes_different_sequence_metadata(self):
+        msa1 = TabularMSA([DNA('AC', metadata={'id': 'a'})])
+        msa2 = TabularMSA([DNA('AC', metadata={'id': 'b'})])
+        self.assertReallyNotEqual(msa1, msa2)
+
     def test_eq_constructed_from_different_iterables_compare_equal(self):
         msa1 = TabularMSA([DNA('ACGT')])
         msa2 = TabularMSA((DNA('ACGT'),))
@@ -595,23 +657,18 @@ class TestTabularMSA(unittest.TestCase, ReallyEqualMixin):
         assert_index_equal(msa.index, pd.RangeIndex(2))
 
     def test_reassign_index_minter_and_mapping_both_provided(self):
-        msa = TabularMSA([DNA('ACGT'), DNA('TGCA')], minter=str)
+        msa = self.minted_msa
 
-        with self.assertRaisesRegex(ValueError, r'both.*mapping.*minter.*'):
-            msa.reassign_index(minter=str, mapping={"ACGT": "fleventy"})
-
-        # original state is maintained
-        assert_index_equal(msa.index, pd.Index(['ACGT', 'TGCA']))
+        self.assertRaisesAndIndexPreserved(
+            msa, ValueError, r'both.*mapping.*minter.*',
+            msa.reassign_index, minter=str, mapping={"ACGT": "fleventy"})
 
     def test_reassign_index_mapping_invalid_type(self):
-        msa = TabularMSA([DNA('ACGT'), DNA('TGCA')], minter=str)
+        msa = self.minted_msa
 
-        with self.assertRaisesRegex(TypeError,
-                                    r'mapping.*dict.*callable.*list'):
-            msa.reassign_index(mapping=['abc', 'def'])
-
-        # original state is maintained
-        assert_index_equal(msa.index, pd.Index(['ACGT', 'TGCA']))
+        self.assertRaisesAndIndexPreserved(
+            msa, TypeError, r'mapping.*dict.*callable.*list',
+            msa.reassign_index, mapping=['abc', 'def'])
 
     def test_reassign_index_with_mapping_dict_empty(self):
         seqs = [DNA("A"), DNA("C"), DNA("G")]
@@ -707,40 +764,82 @@ class TestTabularMSA(unittest.TestCase, ReallyEqualMixin):
             TabularMSA([DNA('AAA'), DNA('ACG'), DNA('---')],
                        index=[42, 41, 'foo']))
 
-    def test_sort_empty_on_msa_index(self):
-        msa = TabularMSA([], index=[])
-        msa.sort()
-        self.assertEqual(msa, TabularMSA([], index=[]))
-
-        msa = TabularMSA([], index=[])
-        msa.sort(ascending=False)
-        self.assertEqual(msa, TabularMSA([], index=[]))
-
-    def test_sort_single_sequence_on_msa_index(self):
-        msa = TabularMSA([DNA('ACGT')], index=[42])
-        msa.sort()
-        self.assertEqual(msa, TabularMSA([DNA('ACGT')], index=[42]))
-
-        msa = TabularMSA([DNA('ACGT')], index=[42])
-        msa.sort(ascending=False)
-        self.assertEqual(msa, TabularMSA([DNA('ACGT')], index=[42]))
-
-    def test_sort_multiple_sequences_on_msa_index(self):
-        msa = TabularMSA([
-            DNA('TC'), DNA('GG'), DNA('CC')], index=['z', 'a', 'b'])
-        msa.sort(ascending=True)
-        self.assertEqual(
-            msa,
-            TabularMSA([
-                DNA('GG'), DNA('CC'), DNA('TC')], index=['a', 'b', 'z']))
-
-        msa = TabularMSA([
-            DNA('TC'), DNA('GG'), DNA('CC')], index=['z', 'a', 'b'])
-        msa.sort(ascending=False)
-        self.assertEqual(
-            msa,
-            TabularMSA([
-                DNA('TC'), DNA('CC'), DNA('GG')], index=['z', 'b', 'a']))
+    def test_sort(self):
+        # (description, MSA to sort, sort kwargs, expected MSA)
+        cases = [
+            ('empty', TabularMSA([], index=[]), {},
+             TabularMSA([], index=[])),
+            ('empty descending', TabularMSA([], index=[]),
+             {'ascending': False}, TabularMSA([], index=[])),
+            ('single sequence', TabularMSA([DNA('ACGT')], index=[42]), {},
+             TabularMSA([DNA('ACGT')], index=[42])),
+            ('single sequence descending',
+             TabularMSA([DNA('ACGT')], index=[42]), {'ascending': False},
+             TabularMSA([DNA('ACGT')], index=[42])),
+            ('multiple sequences',
+             TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')],
+                        index=['z', 'a', 'b']), {'ascending': True},
+             TabularMSA([DNA('GG'), DNA('CC'), DNA('TC')],
+                        index=['a', 'b', 'z'])),
+            ('multiple sequences descending',
+             TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')],
+                        index=['z', 'a', 'b']), {'ascending': False},
+             TabularMSA([DNA('TC'), DNA('CC'), DNA('GG')],
+                        index=['z', 'b', 'a'])),
+            ('key with all repeats',
+             TabularMSA([DNA('TTT', metadata={'id': 'a'}),
+                         DNA('TTT', metadata={'id': 'b'}),
+                         DNA('TTT', metadata={'id': 'c'})], minter=str), {},
+             TabularMSA([DNA('TTT', metadata={'id': 'a'}),
+                         DNA('TTT', metadata={'id': 'b'}),
+                         DNA('TTT', metadata={'id': 'c'})], minter=str)),
+            ('default index',
+             TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')]), {},
+             TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')])),
+            ('default index descending',
+             TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')]),
+             {'ascending': False},
+             TabularMSA([DNA('CC'), DNA('GG'), DNA('TC')], index=[2, 1, 0])),
+            ('already sorted',
+             TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')], index=[1, 2, 3]),
+             {},
+             TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')], index=[1, 2, 3])),
+            ('already sorted descending',
+             TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')], index=[3, 2, 1]),
+             {'ascending': False},
+             TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')], index=[3, 2, 1])),
+            ('reverse sorted',
+             TabularMSA([DNA('T'), DNA('G'), DNA('A')], index=[3, 2, 1]), {},
+             TabularMSA([DNA('A'), DNA('G'), DNA('T')], index=[1, 2, 3])),
+            ('reverse sorted descending',
+             TabularMSA([DNA('T'), DNA('G'), DNA('A')], index=[1, 2, 3]),
+             {'ascending': False},
+             TabularMSA([DNA('A'), DNA('G'), DNA('T')], index=[3, 2, 1])),
+            ('multiindex',
+             TabularMSA([DNA('A'), DNA('C'), DNA('G')],
+                        index=[(2, 'a'), (1, 'c'), (3, 'b')]), {},
+             TabularMSA([DNA('C'), DNA('A'), DNA('G')],
+                        index=[(1, 'c'), (2, 'a'), (3, 'b')])),
+            ('multiindex already sorted',
+             TabularMSA([DNA('A'), DNA('C'), DNA('G')],
+                        index=[(1, 'b'), (1, 'c'), (2, 'a')]), {},
+             TabularMSA([DNA('A'), DNA('C'), DNA('G')],
+                        index=[(1, 'b'), (1, 'c'), (2, 'a')])),
+            ('multiindex reverse sorted',
+             TabularMSA([DNA('A'), DNA('C'), DNA('G')],
+                        index=[(2, 'a'), (1, 'c'), (1, 'b')]), {},
+             TabularMSA([DNA('G'), DNA('C'), DNA('A')],
+                        index=[(1, 'b'), (1, 'c'), (2, 'a')])),
+            ('multiindex reverse sorted with repeats',
+             TabularMSA([DNA('A'), DNA('C'), DNA('G')],
+                        index=[(2, 'a'), (1, 'b'), (1, 'b')]), {},
+             TabularMSA([DNA('C'), DNA('G'), DNA('A')],
+                        index=[(1, 'b'), (1, 'b'), (2, 'a')])),
+        ]
+        for description, msa, kwargs, expected in cases:
+            with self.subTest(description):
+                msa.sort(**kwargs)
+                self.assertEqual(msa, expected)
 
     def test_sort_on_labels_with_some_repeats(self):
         msa = TabularMSA([
@@ -760,67 +859,6 @@ class TestTabularMSA(unittest.TestCase, ReallyEqualMixin):
         self.assertIn(DNA('TGGG', metadata={'id': 10}), vals[2:])
         self.assertIn(DNA('TAGA', metadata={'id': 10}), vals[2:])
 
-    def test_sort_on_key_with_all_repeats(self):
-        msa = TabularMSA([
-            DNA('TTT', metadata={'id': 'a'}),
-            DNA('TTT', metadata={'id': 'b'}),
-            DNA('TTT', metadata={'id': 'c'})], minter=str)
-        msa.sort()
-        self.assertEqual(
-            msa,
-            TabularMSA([
-                DNA('TTT', metadata={'id': 'a'}),
-                DNA('TTT', metadata={'id': 'b'}),
-                DNA('TTT', metadata={'id': 'c'})], minter=str))
-
-    def test_sort_default_index(self):
-        msa = TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')])
-        msa.sort()
-        self.assertEqual(
-            msa,
-            TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')]))
-
-    def test_sort_default_index_descending(self):
-        msa = TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')])
-        msa.sort(ascending=False)
-        self.assertEqual(
-            msa,
-            TabularMSA([DNA('CC'), DNA('GG'), DNA('TC')], index=[2, 1, 0]))
-
-    def test_sort_already_sorted(self):
-        msa = TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')], index=[1, 2, 3])
-        msa.sort()
-        self.assertEqual(
-            msa,
-            TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')], index=[1, 2, 3]))
-
-        msa = TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')], index=[3, 2, 1])
-        msa.sort(ascending=False)
-        self.assertEqual(
-            msa,
-            TabularMSA([DNA('TC'), DNA('GG'), DNA('CC')], index=[3, 2, 1]))
-
-    def test_sort_reverse_sorted(self):
-        msa = TabularMSA([DNA('T'), DNA('G'), DNA('A')], index=[3, 2, 1])
-        msa.sort()
-        self.assertEqual(
-            msa,
-            TabularMSA([DNA('A'), DNA('G'), DNA('T')], index=[1, 2, 3]))
-
-        msa = TabularMSA([DNA('T'), DNA('G'), DNA('A')], index=[1, 2, 3])
-        msa.sort(ascending=False)
-        self.assertEqual(
-            msa,
-            TabularMSA([DNA('A'), DNA('G'), DNA('T')], index=[3, 2, 1]))
-
-    def test_sort_multiindex(self):
-        multiindex = [(2, 'a'), (1, 'c'), (3, 'b')]
-        sortedindex = [(1, 'c'), (2, 'a'), (3, 'b')]
-        msa = TabularMSA([DNA('A'), DNA('C'), DNA('G')], index=multiindex)
-        msa.sort()
-        self.assertEqual(msa, TabularMSA([DNA('C'), DNA('A'), DNA('G')],
-                                         index=sortedindex))
-
     def test_sort_multiindex_with_level(self):
         multiindex = [(2, 'a'), (1, 'c'), (3, 'b')]
         first_sorted = [(1, 'c'), (2, 'a'), (3, 'b')]
@@ -998,6 +1036,37 @@ class TestDeepCopy(unittest.TestCase):
         assert_index_equal(msa.index, pd.Index(['foo', 'bar']))
 
 
+class TestPickle(unittest.TestCase):
+    def test_roundtrip(self):
+        msa = TabularMSA([DNA('ACGT'), DNA('TGCA')], index=['foo', 'bar'])
+        # Populate the packed bytes cache before pickling.
+        msa == TabularMSA([DNA('ACGT'), DNA('TGCA')], index=['foo', 'bar'])
+
+        obs = pickle.loads(pickle.dumps(msa))
+
+        self.assertIsNone(obs._packed)
+        self.assertEqual(obs, msa)
+
+    def test_state_without_packed_bytes(self):
+        # Emulate unpickling an MSA pickled before the packed bytes cache
+        # was added.
+        msa = TabularMSA([DNA('ACGT'), DNA('TGCA')], index=['foo', 'bar'])
+        state = msa.__dict__.copy()
+        del state['_packed']
+
+        obs = TabularMSA.__new__(TabularMSA)
+        obs.__setstate__(state)
+
+        self.assertEqual(obs, msa)
+        obs.append(DNA('AAAA'), reset_index=True)
+        self.assertEqual(
+            obs, TabularMSA([DNA('ACGT'), DNA('TGCA'), DNA('AAAA')]))
+        obs.sort(ascending=False)
+        self.assertEqual(
+            obs, TabularMSA([DNA('AAAA'), DNA('TGCA'), DNA('ACGT')],
+                            index=[2, 1, 0]))
+
+
 class SharedIndexTests:
     def get(self, obj, indexable):
         raise NotImplementedError()
@@ -1151,8 +1220,10 @@ class SharedIndexTests:
 
 
 class SharedPropertyIndexTests(SharedIndexTests):
-    def setUp(self):
-        self.combo_msa = TabularMSA([
+    @classmethod
+    def setUpClass(cls):
+        # Indexing never mutates the source MSA, so every test can share it.
+        cls.combo_msa = TabularMSA([
             DNA('ACGTA', metadata={0: 0},
                 positional_metadata={0: [1, 2, 3, 4, 5]}),
             DNA('CGTAC', metadata={1: 1},
@@ -1166,6 +1237,7 @@ class SharedPropertyIndexTests(SharedIndexTests):
             ], index=list('ABCDE'), metadata={'x': 'x'},
             positional_metadata={'y': [5, 4, 3, 2, 1]})
 
+    def setUp(self):
         """First off, sorry to the next person who has to deal with this.
 
            The next few tests will try and slice by a bunch of stuff, with
@@ -1203,26 +1275,33 @@ class SharedPropertyIndexTests(SharedIndexTests):
         self.combo_second_axis = self.combo_first_axis
 
     def test_combo_single_axis_natural(self):
-        for idx, exp in self.combo_first_axis:
-            self.assertEqual(self.get(self.combo_msa, idx),
-                             self.combo_msa.iloc[exp],
-                             msg="%r did not match iloc[%r]" % (idx, exp))
+        for i, (idx, exp) in enumerate(self.combo_first_axis):
+            with self.subTest(i=i):
+                self.assertEqual(self.get(self.combo_msa, idx),
+                                 self.combo_msa.iloc[exp],
+                                 msg="%r did not match iloc[%r]" % (idx, exp))
 
     def test_combo_first_axis_only(self):
-        for idx, exp in self.combo_first_axis:
-            self.assertEqual(self.get(self.combo_msa, idx, axis=0),
-                             self.combo_msa.iloc[exp, ...],
-                             msg="%r did not match iloc[%r, ...]" % (idx, exp))
+        for i, (idx, exp) in enumerate(self.combo_first_axis):
+            with self.subTest(i=i):
+                self.assertEqual(self.get(self.combo_msa, idx, axis=0),
+                                 self.combo_msa.iloc[exp, ...],
+                                 msg="%r did not match iloc[%r, ...]"
+                                     % (idx, exp))
 
     def test_combo_second_axis_only(self):
-        for idx, exp in self.combo_second_axis:
-            self.assertEqual(self.get(self.combo_msa, idx, axis=1),
-                             self.combo_msa.iloc[..., exp],
-                             msg="%r did not match iloc[..., %r]" % (idx, exp))
+        for j, (idx, exp) in enumerate(self.combo_second_axis):
+            with self.subTest(j=j):
+                self.assertEqual(self.get(self.combo_msa, idx, axis=1),
+                                 self.combo_msa.iloc[..., exp],
+                                 msg="%r did not match iloc[..., %r]"
+                                     % (idx, exp))
 
     def test_combo_both_axes(self):
-        for idx1, exp1 in self.combo_first_axis:
-            for idx2, exp2 in self.combo_second_axis:
+        for (i, (idx1, exp1)), (j, (idx2, exp2)) in itertools.product(
+                enumerate(self.combo_first_axis),
+                enumerate(self.combo_second_axis)):
+            with self.subTest(i=i, j=j):
                 self.assertEqual(self.get(self.combo_msa, (idx1, idx2)),
                                  self.combo_msa.iloc[exp1, exp2],
                                  msg=("%r did not match iloc[%r, %r]"
@@ -1842,6 +1921,17 @@ class TestAppend(unittest.TestCase):
 
             self.assertEqual(msa, TabularMSA([]))
 
+    def test_invalid_parameter_combos_non_empty_msa(self):
+        msa = TabularMSA([DNA('ACGT')], index=['a'])
+
+        for params in ({}, {'minter': str, 'index': 'foo'}):
+            with self.subTest(params=params):
+                with self.assertRaisesRegex(
+                        ValueError, r"one of.*minter.*index.*reset_index"):
+                    msa.append(DNA('ACGT'), **params)
+
+                self.assertEqual(msa, TabularMSA([DNA('ACGT')], index=['a']))
+
     def test_invalid_dtype(self):
         msa = TabularMSA([])
 
@@ -2055,6 +2145,18 @@ class TestAppend(unittest.TestCase):
             msa,
             TabularMSA([DNA('AA')]))
 
+    def test_non_empty_msa_keeps_positional_metadata(self):
+        msa = TabularMSA([DNA('AC')], positional_metadata={'foo': [1, 2]})
+        seq = DNA('G-')
+
+        msa.append(seq, reset_index=True)
+
+        self.assertIs(msa[1], seq)
+        self.assertEqual(
+            msa,
+            TabularMSA([DNA('AC'), DNA('G-')],
+                       positional_metadata={'foo': [1, 2]}))
+
 
 class TestExtend(unittest.TestCase):
     # Error cases
@@ -2925,6 +3027,13 @@ class TestConsensus(unittest.TestCase):
 
         self.assertEqual(cons, Sequence(''))
 
+    def test_no_sequences_with_positional_metadata(self):
+        msa = TabularMSA([], positional_metadata={'foo': []})
+
+        cons = msa.consensus()
+
+        self.assertEqual(cons, Sequence('', positional_metadata={'foo': []}))
+
     def test_no_positions(self):
         msa = TabularMSA([DNA(''),
                           DNA('')])
@@ -3312,95 +3421,110 @@ class TestConservation(unittest.TestCase):
 
 
 class TestGapFrequencies(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # gap_frequencies doesn't modify the MSA, so MSAs used by more than
+        # one test are shared.
+        cls.empty_msa = TabularMSA([])
+        cls.msa_3x4 = TabularMSA([DNA('ACGT'),
+                                  DNA('A.G-'),
+                                  DNA('----')])
+        cls.msa_2x2 = TabularMSA([DNA('AC'),
+                                  DNA('-.')])
+        cls.msa_1x2 = TabularMSA([DNA('.T')])
+        cls.msa_2x1 = TabularMSA([DNA('.'),
+                                  DNA('T')])
+
     def test_default_behavior(self):
         msa = TabularMSA([DNA('AA.'),
                           DNA('-A-')])
 
         freqs = msa.gap_frequencies()
 
-        npt.assert_array_equal(np.array([1, 0, 2]), freqs)
+        self.assertEqual(freqs.tolist(), [1, 0, 2])
 
     def test_invalid_axis_str(self):
         with self.assertRaisesRegex(ValueError, r"axis.*'foo'"):
-            TabularMSA([]).gap_frequencies(axis='foo')
+            self.empty_msa.gap_frequencies(axis='foo')
 
     def test_invalid_axis_int(self):
         with self.assertRaisesRegex(ValueError, r"axis.*2"):
-            TabularMSA([]).gap_frequencies(axis=2)
+            self.empty_msa.gap_frequencies(axis=2)
 
     def test_position_axis_str_and_int_equivalent(self):
-        msa = TabularMSA([DNA('ACGT'),
-                          DNA('A.G-'),
-                          DNA('----')])
+        msa = self.msa_3x4
 
         str_freqs = msa.gap_frequencies(axis='position')
         int_freqs = msa.gap_frequencies(axis=1)
 
         npt.assert_array_equal(str_freqs, int_freqs)
-        npt.assert_array_equal(np.array([0, 2, 4]), str_freqs)
+        self.assertEqual(str_freqs.tolist(), [0, 2, 4])
 
     def test_sequence_axis_str_and_int_equivalent(self):
-        msa = TabularMSA([DNA('ACGT'),
-                          DNA('A.G-'),
-                          DNA('----')])
+        msa = self.msa_3x4
 
         str_freqs = msa.gap_frequencies(axis='sequence')
         int_freqs = msa.gap_frequencies(axis=0)
 
         npt.assert_array_equal(str_freqs, int_freqs)
-        npt.assert_array_equal(np.array([1, 2, 1, 2]), str_freqs)
+        self.assertEqual(str_freqs.tolist(), [1, 2, 1, 2])
+
+    def test_sequences_without_positions(self):
+        msa = TabularMSA([DNA(''), DNA('')])
+
+        self.assertEqual(msa.gap_frequencies(axis='sequence').tolist(), [])
+        self.assertEqual(msa.gap_frequencies(axis='position').tolist(),
+                         [0, 0])
 
     def test_correct_dtype_absolute_empty(self):
-        msa = TabularMSA([])
+        msa = self.empty_msa
 
         freqs = msa.gap_frequencies(axis='position')
 
-        npt.assert_array_equal(np.array([]), freqs)
+        self.assertEqual(freqs.tolist(), [])
         self.assertEqual(int, freqs.dtype)
 
     def test_correct_dtype_relative_empty(self):
-        msa = TabularMSA([])
+        msa = self.empty_msa
 
         freqs = msa.gap_frequencies(axis='position', relative=True)
 
-        npt.assert_array_equal(np.array([]), freqs)
+        self.assertEqual(freqs.tolist(), [])
         self.assertEqual(float, freqs.dtype)
 
     def test_correct_dtype_absolute_non_empty(self):
-        msa = TabularMSA([DNA('AC'),
-                          DNA('-.')])
+        msa = self.msa_2x2
 
         freqs = msa.gap_frequencies(axis='position')
 
-        npt.assert_array_equal(np.array([0, 2]), freqs)
+        self.assertEqual(freqs.tolist(), [0, 2])
         self.assertEqual(int, freqs.dtype)
 
     def test_correct_dtype_relative_non_empty(self):
-        msa = TabularMSA([DNA('AC'),
-                          DNA('-.')])
+        msa = self.msa_2x2
 
         freqs = msa.gap_frequencies(axis='position', relative=True)
 
-        npt.assert_array_equal(np.array([0.0, 1.0]), freqs)
+        self.assertEqual(freqs.tolist(), [0.0, 1.0])
         self.assertEqual(float, freqs.dtype)
 
     def test_no_sequences_absolute(self):
-        msa = TabularMSA([])
+        msa = self.empty_msa
 
         seq_freqs = msa.gap_frequencies(axis='sequence')
         pos_freqs = msa.gap_frequencies(axis='position')
 
-        npt.assert_array_equal(np.array([]), seq_freqs)
-        npt.assert_array_equal(np.array([]), pos_freqs)
+        self.assertEqual(seq_freqs.tolist(), [])
+        self.assertEqual(pos_freqs.tolist(), [])
 
     def test_no_sequences_relative(self):
-        msa = TabularMSA([])
+        msa = self.empty_msa
 
         seq_freqs = msa.gap_frequencies(axis='sequence', relative=True)
         pos_freqs = msa.gap_frequencies(axis='position', relative=True)
 
-        npt.assert_array_equal(np.array([]), seq_freqs)
-        npt.assert_array_equal(np.array([]), pos_freqs)
+        self.assertEqual(seq_freqs.tolist(), [])
+        self.assertEqual(pos_freqs.tolist(), [])
 
     def test_no_positions_absolute(self):
         msa = TabularMSA([DNA('')])
@@ -3408,8 +3532,8 @@ class TestGapFrequencies(unittest.TestCase):
         seq_freqs = msa.gap_frequencies(axis='sequence')
         pos_freqs = msa.gap_frequencies(axis='position')
 
-        npt.assert_array_equal(np.array([]), seq_freqs)
-        npt.assert_array_equal(np.array([0]), pos_freqs)
+        self.assertEqual(seq_freqs.tolist(), [])
+        self.assertEqual(pos_freqs.tolist(), [0])
 
     def test_no_positions_relative(self):
         msa = TabularMSA([DNA('')])
@@ -3417,46 +3541,44 @@ class TestGapFrequencies(unittest.TestCase):
         seq_freqs = msa.gap_frequencies(axis='sequence', relative=True)
         pos_freqs = msa.gap_frequencies(axis='position', relative=True)
 
-        npt.assert_array_equal(np.array([]), seq_freqs)
+        self.assertEqual(seq_freqs.tolist(), [])
         npt.assert_array_equal(np.array([np.nan]), pos_freqs)
 
     def test_single_sequence_absolute(self):
-        msa = TabularMSA([DNA('.T')])
+        msa = self.msa_1x2
 
         seq_freqs = msa.gap_frequencies(axis='sequence')
         pos_freqs = msa.gap_frequencies(axis='position')
 
-        npt.assert_array_equal(np.array([1, 0]), seq_freqs)
-        npt.assert_array_equal(np.array([1]), pos_freqs)
+        self.assertEqual(seq_freqs.tolist(), [1, 0])
+        self.assertEqual(pos_freqs.tolist(), [1])
 
     def test_single_sequence_relative(self):
-        msa = TabularMSA([DNA('.T')])
+        msa = self.msa_1x2
 
         seq_freqs = msa.gap_frequencies(axis='sequence', relative=True)
         pos_freqs = msa.gap_frequencies(axis='position', relative=True)
 
-        npt.assert_array_equal(np.array([1.0, 0.0]), seq_freqs)
-        npt.assert_array_equal(np.array([0.5]), pos_freqs)
+        self.assertEqual(seq_freqs.tolist(), [1.0, 0.0])
+        self.assertEqual(pos_freqs.tolist(), [0.5])
 
     def test_single_position_absolute(self):
-        msa = TabularMSA([DNA('.'),
-                          DNA('T')])
+        msa = self.msa_2x1
 
         seq_freqs = msa.gap_frequencies(axis='sequence')
         pos_freqs = msa.gap_frequencies(axis='position')
 
-        npt.assert_array_equal(np.array([1]), seq_freqs)
-        npt.assert_array_equal(np.array([1, 0]), pos_freqs)
+        self.assertEqual(seq_freqs.tolist(), [1])
+        self.assertEqual(pos_freqs.tolist(), [1, 0])
 
     def test_single_position_relative(self):
-        msa = TabularMSA([DNA('.'),
-                          DNA('T')])
+        msa = self.msa_2x1
 
         seq_freqs = msa.gap_frequencies(axis='sequence', relative=True)
         pos_freqs = msa.gap_frequencies(axis='position', relative=True)
 
-        npt.assert_array_equal(np.array([0.5]), seq_freqs)
-        npt.assert_array_equal(np.array([1.0, 0.0]), pos_freqs)
+        self.assertEqual(seq_freqs.tolist(), [0.5])
+        self.assertEqual(pos_freqs.tolist(), [1.0, 0.0])
 
     def test_position_axis_absolute(self):
         msa = TabularMSA([
@@ -3467,7 +3589,7 @@ class TestGapFrequencies(unittest.TestCase):
 
         freqs = msa.gap_frequencies(axis='position')
 
-        npt.assert_array_equal(np.array([0, 2, 4, 4]), freqs)
+        self.assertEqual(freqs.tolist(), [0, 2, 4, 4])
 
     def test_position_axis_relative(self):
         msa = TabularMSA([DNA('ACGT'),
@@ -3478,7 +3600,7 @@ class TestGapFrequencies(unittest.TestCase):
 
         freqs = msa.gap_frequencies(axis='position', relative=True)
 
-        npt.assert_array_equal(np.array([0.0, 0.5, 0.25, 1.0, 1.0]), freqs)
+        self.assertEqual(freqs.tolist(), [0.0, 0.5, 0.25, 1.0, 1.0])
 
     def test_sequence_axis_absolute(self):
         msa = TabularMSA([DNA('AC-.'),
@@ -3487,7 +3609,7 @@ class TestGapFrequencies(unittest.TestCase):
 
         freqs = msa.gap_frequencies(axis='sequence')
 
-        npt.assert_array_equal(np.array([0, 2, 3, 3]), freqs)
+        self.assertEqual(freqs.tolist(), [0, 2, 3, 3])
 
     def test_sequence_axis_relative(self):
         msa = TabularMSA([DNA('AC--.'),
@@ -3496,7 +3618,7 @@ class TestGapFrequencies(unittest.TestCase):
 
         freqs = msa.gap_frequencies(axis='sequence', relative=True)
 
-        npt.assert_array_equal(np.array([0.0, 2/3, 1/3, 1.0, 1.0]), freqs)
+        self.assertEqual(freqs.tolist(), [0.0, 2/3, 1/3, 1.0, 1.0])
 
     def test_relative_frequencies_precise(self):
         class CustomSequence(GrammaredSequence):
@@ -3524,7 +3646,7 @@ class TestGapFrequencies(unittest.TestCase):
 
         freqs = msa.gap_frequencies(axis='position', relative=True)
 
-        npt.assert_array_equal(np.array([1.0]), freqs)
+        self.assertEqual(freqs.tolist(), [1.0])
 
     def test_custom_gap_characters(self):
         class CustomSequence(GrammaredSequence):
@@ -3556,7 +3678,25 @@ class TestGapFrequencies(unittest.TestCase):
 
         freqs = msa.gap_frequencies(axis='position')
 
-        npt.assert_array_equal(np.array([0, 0, 2, 4, 4]), freqs)
+        self.assertEqual(freqs.tolist(), [0, 0, 2, 4, 4])
+
+    def test_updates_after_extend_and_sort(self):
+        msa = TabularMSA([DNA('A-'), DNA('--')], index=['b', 'a'])
+        self.assertEqual(msa.gap_frequencies(axis='position').tolist(),
+                         [1, 2])
+
+        msa.extend([DNA('AA')], index=['c'])
+        self.assertEqual(msa.gap_frequencies(axis='position').tolist(),
+                         [1, 2, 0])
+        self.assertEqual(msa.gap_frequencies().tolist(), [1, 2])
+
+        msa.sort()
+        self.assertEqual(msa.gap_frequencies(axis='position').tolist(),
+                         [2, 1, 0])
+
+        msa.sort(ascending=False)
+        self.assertEqual(msa.gap_frequencies(axis='position').tolist(),
+                         [0, 1, 2])
 
 
 class TestGetPosition(unittest.TestCase):
@@ -3581,8 +3721,9 @@ class TestGetPosition(unittest.TestCase):
 
 
 class TestIsSequenceAxis(unittest.TestCase):
-    def setUp(self):
-        self.msa = TabularMSA([])
+    @classmethod
+    def setUpClass(cls):
+        cls.msa = TabularMSA([])
 
     def test_invalid_str(self):
         with self.assertRaisesRegex(ValueError, r"axis.*'foo'"):
@@ -3592,6 +3733,10 @@ class TestIsSequenceAxis(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, r"axis.*2"):
             self.msa._is_sequence_axis(2)
 
+    def test_invalid_unhashable(self):
+        with self.assertRaisesRegex(ValueError, r"axis.*\[0\]"):
+            self.msa._is_sequence_axis([0])
+
     def test_positive_str(self):
         self.assertTrue(self.msa._is_sequence_axis('sequence'))
 
@@ -14,6 +14,7 @@ from scipy.optimize import fmin_powell, minimize_scalar
 
 from skbio.stats import subsample_counts
 from skbio.diversity._util import _validate_counts_vector
+from skbio.util import get_rng
 from skbio.util._warning import _warn_deprecated
 
 
@@ -646,7 +647,7 @@ def menhinick(counts):
     return sobs(counts) / np.sqrt(counts.sum())
 
 
-def michaelis_menten_fit(counts, num_repeats=1, params_guess=None):
+def michaelis_menten_fit(counts, num_repeats=1, params_guess=None, seed=None):
     r"""Calculate Michaelis-Menten fit to rarefaction curve of observed taxa.
 
     The Michaelis-Menten equation is defined as:
@@ -674,6 +675,9 @@ def michaelis_menten_fit(counts, num_repeats=1, params_guess=None):
         Initial guess of :math:`S_{max}` and :math:`B`. If ``None``, default
         guess for :math:`S_{max}` is :math:`S` (as :math:`S_{max}` should
         be >= :math:`S`) and default guess for :math:`B` is ``round(N / 2)``.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance, used for
+        rarefaction.
 
     Returns
     -------
@@ -708,11 +712,12 @@ def michaelis_menten_fit(counts, num_repeats=1, params_guess=None):
         params_guess = (S_max_guess, B_guess)
 
     # observed # of taxa vs # of individuals sampled, S vs n
+    rng = get_rng(seed)
     xvals = np.arange(1, n_indiv + 1)
     ymtx = np.empty((num_repeats, len(xvals)), dtype=int)
     for i in range(num_repeats):
         ymtx[i] = np.asarray(
-            [sobs(subsample_counts(counts, n)) for n in xvals], dtype=int
+            [sobs(subsample_counts(counts, n, seed=rng)) for n in xvals], dtype=int
         )
     yvals = ymtx.mean(0)
 
@@ -220,6 +220,14 @@ class BaseTests(TestCase):
         # [0,2,4,6] looks like 3 taxa with maybe more to be found.
         self.assertTrue(obs_few > obs_many)
 
+    def test_michaelis_menten_fit_seed(self):
+        counts = np.arange(4) * 2
+        obs1 = michaelis_menten_fit(counts, num_repeats=3, seed=42)
+        # a generator is used as is
+        obs2 = michaelis_menten_fit(counts, num_repeats=3,
+                                    seed=np.random.default_rng(42))
+        self.assertEqual(obs1, obs2)
+
     def test_observed_features(self):
         for obs in [np.array([4, 3, 4, 0, 1, 0, 2]),
                     np.array([0, 0, 0]),
@@ -11,14 +11,14 @@ import unittest
 import numpy as np
 import numpy.testing as npt
 
-from skbio.stats import subsample_counts
 from skbio.diversity.alpha import lladser_pe, lladser_ci
+from skbio.stats import subsample_counts
 from skbio.diversity.alpha._lladser import (
     _expand_counts, _lladser_point_estimates,
     _get_interval_for_r_new_taxa, _lladser_ci_series, _lladser_ci_from_r)
 
 
-def create_fake_observation():
+def create_fake_observation(seed=None):
     """Create a subsample with defined property"""
 
     # Create a subsample of a larger sample such that we can compute
@@ -28,7 +28,7 @@ def create_fake_observation():
     counts[0] = 9000
     total = counts.sum()
 
-    fake_obs = subsample_counts(counts, 1000)
+    fake_obs = subsample_counts(counts, n=1000, seed=seed)
     exp_p = 1 - sum([x/total for (x, y) in zip(counts, fake_obs) if y > 0])
 
     return fake_obs, exp_p
@@ -42,7 +42,7 @@ class LladserTests(unittest.TestCase):
         self.assertTrue(np.isnan(obs))
 
         np.random.seed(123456789)
-        fake_obs, exp_p = create_fake_observation()
+        fake_obs, exp_p = create_fake_observation(seed=42)
         reps = 100
         sum = 0
         for i in range(reps):
@@ -63,10 +63,11 @@ class LladserTests(unittest.TestCase):
     def test_lladser_ci(self):
         """lladser_ci estimate using defaults contains p with 95% prob"""
         np.random.seed(12345678)
+        rng = np.random.default_rng(42)
         reps = 100
         sum = 0
         for i in range(reps):
-            fake_obs, exp_p = create_fake_observation()
+            fake_obs, exp_p = create_fake_observation(seed=rng)
             (low, high) = lladser_ci(fake_obs, r=10)
             if (low <= exp_p <= high):
                 sum += 1
@@ -82,12 +83,13 @@ class LladserTests(unittest.TestCase):
         # of all test runs. To make this test pass reliable we thus have to
         # set a defined seed
         np.random.seed(12345678)
+        rng = np.random.default_rng(42)
         reps = 100
         sum = 0
         for i in range(reps):
             # re-create the obs for every estimate, such that they are truly
             # independent events
-            fake_obs, exp_p = create_fake_observation()
+            fake_obs, exp_p = create_fake_observation(seed=rng)
             (low, high) = lladser_ci(fake_obs, r=14, f=3)
             if (low <= exp_p <= high):
                 sum += 1
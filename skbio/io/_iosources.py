@@ -11,8 +11,7 @@ import gzip
 import bz2
 import tempfile
 import itertools
-
-import requests
+from urllib.parse import urlparse
 
 from skbio.io import IOSourceError
 from ._fileobject import (
@@ -97,11 +96,15 @@ class FilePathSource(IOSource):
 
 class HTTPSource(IOSource):
     def can_read(self):
-        return isinstance(self.file, str) and requests.compat.urlparse(
-            self.file
-        ).scheme in {"http", "https"}
+        return isinstance(self.file, str) and urlparse(self.file).scheme in {
+            "http",
+            "https",
+        }
 
     def get_reader(self):
+        # requests is slow to import and only needed for URLs
+        import requests
+
         req = requests.get(self.file)
 
         # if the response is not 200, an exception will be raised
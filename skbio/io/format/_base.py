@@ -224,6 +224,29 @@ def _line_generator(fh, skip_blanks=False, strip=True):
             yield line
 
 
+def _block_line_generator(fh, block_size=65536):
+    # Same lines as _line_generator(fh) (stripped, blanks kept), but read in
+    # blocks, which avoids the per-line overhead of iterating over a file
+    # object. Reads ahead of the last line yielded, so it must not be mixed
+    # with other reads from `fh`.
+    #
+    # Lines are split with str.splitlines, so "\r" and "\r\n" terminate
+    # lines too when `fh` does not translate newlines. The last line of each
+    # block is carried over to the next one even if it is terminated, as a
+    # "\r" at the end of a block may be the first half of a "\r\n".
+    tail = ""
+    while True:
+        block = fh.read(block_size)
+        if not block:
+            break
+        lines = (tail + block).splitlines(True)
+        tail = lines.pop()
+        for line in lines:
+            yield line.strip()
+    if tail:
+        yield tail.strip()
+
+
 def _too_many_blanks(fh, max_blanks):
     count = 0
     too_many = False
@@ -617,7 +617,7 @@ from skbio.io.format._base import (
     _get_nth_sequence,
     _parse_fasta_like_header,
     _format_fasta_like_records,
-    _line_generator,
+    _block_line_generator,
     _too_many_blanks,
 )
 from skbio.util._misc import chunk_str
@@ -907,10 +907,13 @@ def _parse_fasta_raw(fh, data_parser, error_type):
     the caller to construct the correct in-memory object to hold the data.
 
     """
+    lines = _block_line_generator(fh)
+
     # Skip any blank or whitespace-only lines at beginning of file
-    try:
-        seq_header = next(_line_generator(fh, skip_blanks=True))
-    except StopIteration:
+    for seq_header in lines:
+        if seq_header:
+            break
+    else:
         return
 
     # header check inlined here and below for performance
@@ -924,7 +927,7 @@ def _parse_fasta_raw(fh, data_parser, error_type):
 
     data_chunks = []
     prev = seq_header
-    for line in _line_generator(fh, skip_blanks=False):
+    for line in lines:
         if line.startswith(">"):
             # new header, so yield current record and reset state
             yield data_parser(data_chunks), id_, desc
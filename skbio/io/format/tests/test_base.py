@@ -6,6 +6,7 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import io
 import unittest
 
 import numpy.testing as npt
@@ -15,7 +16,8 @@ from skbio import Sequence, DNA, RNA
 from skbio.io.format._base import (_decode_qual_to_phred,
                                    _encode_phred_to_qual, _get_nth_sequence,
                                    _parse_fasta_like_header,
-                                   _format_fasta_like_records)
+                                   _format_fasta_like_records,
+                                   _line_generator, _block_line_generator)
 
 
 class PhredDecoderTests(unittest.TestCase):
@@ -240,6 +242,32 @@ class TestParseFASTALikeHeader(unittest.TestCase):
         self.assertEqual(obs, ('!thus', 'suht!'))
 
 
+class TestBlockLineGenerator(unittest.TestCase):
+    def test_matches_line_generator(self):
+        texts = ['', '\n', 'a', 'a\n', '\n\n  \t\n>a b\n ACGT \n\nAC\n',
+                 '>a\r\nAC\r\n>b\n\tGT']
+        for text in texts:
+            exp = list(_line_generator(io.StringIO(text, newline=None)))
+            # block sizes smaller than a line must give the same lines
+            for block_size in (1, 2, 3, 65536):
+                fh = io.StringIO(text, newline=None)
+                obs = list(_block_line_generator(fh, block_size=block_size))
+                self.assertEqual(obs, exp)
+
+    def test_untranslated_newlines(self):
+        texts = ['>a\rACGT\r>b\rGGCC\r', '>a\r\nAC\r\n\r\nGT',
+                 '\r\r\n\n', 'a\rb\nc\r\nd']
+        for text in texts:
+            exp = list(_line_generator(io.StringIO(text, newline='')))
+            # "\r\n" split across blocks must still be a single terminator
+            for block_size in (1, 2, 3, 65536):
+                with self.subTest(text=text, block_size=block_size):
+                    fh = io.StringIO(text, newline='')
+                    obs = list(_block_line_generator(fh,
+                                                     block_size=block_size))
+                    self.assertEqual(obs, exp)
+
+
 class TestFormatFASTALikeRecords(unittest.TestCase):
     def setUp(self):
         def generator():
@@ -494,6 +494,15 @@ class ReaderTests(TestCase):
             with self.assertRaisesRegex(error_type, error_msg_regex):
                 list(_fasta_to_generator(fp, **kwargs))
 
+    def test_fasta_to_generator_untranslated_carriage_returns(self):
+        fh = io.StringIO('>a\rACGT\r>b\rGG\rCC\r', newline='')
+
+        obs = list(_fasta_to_generator(fh))
+
+        self.assertEqual(obs, [
+            Sequence('ACGT', metadata={'id': 'a', 'description': ''}),
+            Sequence('GGCC', metadata={'id': 'b', 'description': ''})])
+
     # light testing of fasta -> object readers to ensure interface is present
     # and kwargs are passed through. extensive testing of underlying reader is
     # performed above
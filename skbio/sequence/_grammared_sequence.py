@@ -6,6 +6,7 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import functools
 from warnings import warn
 from abc import ABCMeta, abstractproperty
 from itertools import product
@@ -18,6 +19,28 @@ from skbio.util._misc import MiniRegistry
 from ._sequence import Sequence
 
 
+def _memoize_per_class(func):
+    """Memoize a class-level getter separately on each class.
+
+    The value is stored in the class's own namespace, so a subclass never
+    reuses a value computed for its parent (it may define different
+    characters).
+
+    """
+    attr = "_memo%s" % func.__name__
+
+    @functools.wraps(func)
+    def wrapper(cls):
+        try:
+            return cls.__dict__[attr]
+        except KeyError:
+            value = func(cls)
+            setattr(cls, attr, value)
+            return value
+
+    return wrapper
+
+
 class GrammaredSequenceMeta(ABCMeta, type):
     def __new__(mcs, name, bases, dct):
         cls = super(GrammaredSequenceMeta, mcs).__new__(mcs, name, bases, dct)
@@ -154,85 +177,73 @@ class GrammaredSequence(Sequence, metaclass=GrammaredSequenceMeta):
 
     """
 
-    __validation_mask = None
-    __degenerate_codes = None
-    __definite_char_codes = None
-    __gap_codes = None
-    __noncanonical_codes = None
-    __degenerate_hash = None
-    __degen_nonca_hash = None
-    __gap_hash = None
-    __definite_hash = None
-
     @classproperty
+    @_memoize_per_class
     def _validation_mask(cls):
         # TODO These masks could be defined (as literals) on each concrete
         # object. For now, memoize!
-        if cls.__validation_mask is None:
-            as_bytes = "".join(cls.alphabet).encode("ascii")
-            cls.__validation_mask = np.invert(
-                np.bincount(
-                    np.frombuffer(as_bytes, dtype=np.uint8),
-                    minlength=cls._num_extended_ascii_codes,
-                ).astype(bool)
-            )
-        return cls.__validation_mask
+        as_bytes = "".join(cls.alphabet).encode("ascii")
+        return np.invert(
+            np.bincount(
+                np.frombuffer(as_bytes, dtype=np.uint8),
+                minlength=cls._num_extended_ascii_codes,
+            ).astype(bool)
+        )
 
     @classproperty
+    @_memoize_per_class
     def _degenerate_codes(cls):
-        if cls.__degenerate_codes is None:
-            degens = cls.degenerate_chars
-            cls.__degenerate_codes = np.asarray([ord(d) for d in degens])
-        return cls.__degenerate_codes
+        degens = cls.degenerate_chars
+        return np.asarray([ord(d) for d in degens])
 
     @classproperty
+    @_memoize_per_class
     def _definite_char_codes(cls):
-        if cls.__definite_char_codes is None:
-            definite_chars = cls.definite_chars
-            cls.__definite_char_codes = np.asarray([ord(d) for d in definite_chars])
-        return cls.__definite_char_codes
+        definite_chars = cls.definite_chars
+        return np.asarray([ord(d) for d in definite_chars])
 
     @classproperty
+    @_memoize_per_class
     def _gap_codes(cls):
-        if cls.__gap_codes is None:
-            gaps = cls.gap_chars
-            cls.__gap_codes = np.asarray([ord(g) for g in gaps])
-        return cls.__gap_codes
+        # uint8 so that it can be compared with sequence bytes directly
+        gaps = cls.gap_chars
+        gap_codes = np.asarray([ord(g) for g in gaps], dtype=np.uint8)
+        gap_codes.flags.writeable = False
+        return gap_codes
 
     @classproperty
+    @_memoize_per_class
     def _noncanonical_codes(cls):
-        if cls.__noncanonical_codes is None:
-            noncanonical_chars = cls.noncanonical_chars
-            cls.__noncanonical_codes = np.asarray([ord(c) for c in noncanonical_chars])
-        return cls.__noncanonical_codes
+        noncanonical_chars = cls.noncanonical_chars
+        return np.asarray([ord(c) for c in noncanonical_chars])
 
     @classproperty
+    @_memoize_per_class
     def _degenerate_hash(cls):
-        if cls.__degenerate_hash is None:
-            cls.__degenerate_hash = np.zeros((Sequence._num_ascii_codes,), dtype=bool)
-            cls.__degenerate_hash[cls._degenerate_codes] = True
-        return cls.__degenerate_hash
+        degenerate_hash = np.zeros((Sequence._num_ascii_codes,), dtype=bool)
+        degenerate_hash[cls._degenerate_codes] = True
+        return degenerate_hash
 
     @classproperty
+    @_memoize_per_class
     def _degen_nonca_hash(cls):
-        if cls.__degen_nonca_hash is None:
-            cls.__degen_nonca_hash = cls._degenerate_hash.copy()
-            cls.__degen_nonca_hash[cls._noncanonical_codes] = True
-        return cls.__degen_nonca_hash
+        degen_nonca_hash = cls._degenerate_hash.copy()
+        degen_nonca_hash[cls._noncanonical_codes] = True
+        return degen_nonca_hash
 
     @classproperty
+    @_memoize_per_class
     def _gap_hash(cls):
-        if cls.__gap_hash is None:
-            cls.__gap_hash = np.zeros((Sequence._num_ascii_codes,), dtype=bool)
-            cls.__gap_hash[cls._gap_codes] = True
-        return cls.__gap_hash
+        gap_hash = np.zeros((Sequence._num_ascii_codes,), dtype=bool)
+        gap_hash[cls._gap_codes] = True
+        return gap_hash
 
     @classproperty
+    @_memoize_per_class
     def _definite_hash(cls):
-        if cls.__definite_hash is None:
-            cls.__definite_hash = np.zeros((Sequence._num_ascii_codes,), dtype=bool)
-            cls.__definite_hash[cls._definite_char_codes] = True
-        return cls.__definite_hash
+        definite_hash = np.zeros((Sequence._num_ascii_codes,), dtype=bool)
+        definite_hash[cls._definite_char_codes] = True
+        return definite_hash
 
     @classproperty
     def alphabet(cls):
@@ -389,16 +400,18 @@ class GrammaredSequence(Sequence, metaclass=GrammaredSequenceMeta):
     def _validate(self):
         # This is the fastest way that we have found to identify the
         # presence or absence of certain characters (numbers).
-        # It works by multiplying a mask where the numbers which are
-        # permitted have a zero at their index, and all others have a one.
-        # The result is a vector which will propogate counts of invalid
-        # numbers and remove counts of valid numbers, so that we need only
-        # see if the array is empty to determine validity.
-        invalid_characters = (
-            np.bincount(self._bytes, minlength=self._num_extended_ascii_codes)
-            * self._validation_mask
-        )
-        if np.any(invalid_characters):
+        # It works by looking up each character in a mask where the numbers
+        # which are permitted are False and all others are True, so that we
+        # need only see if any lookup is True to determine validity. This is
+        # faster than counting characters (np.bincount) for sequences of any
+        # length, and much faster for the short sequences that are created
+        # most often.
+        validation_mask = self._validation_mask
+        if validation_mask.take(self._bytes).any():
+            invalid_characters = (
+                np.bincount(self._bytes, minlength=self._num_extended_ascii_codes)
+                * validation_mask
+            )
             bad = list(np.where(invalid_characters > 0)[0].astype(np.uint8).view("|S1"))
             raise ValueError(
                 "Invalid character%s in sequence: %r. \n"
@@ -279,6 +279,48 @@ class TestGrammaredSequence(TestCase):
     def test_gap_codes(self):
         gap_codes = set(ExampleGrammaredSequence._gap_codes)
         self.assertEqual(gap_codes, set([45, 46]))
+        self.assertEqual(ExampleGrammaredSequence._gap_codes.dtype, np.uint8)
+
+    def test_gap_codes_subclass_redefines_gap_chars(self):
+        # populate the parent class' memos first
+        self.assertEqual(
+            ExampleGrammaredSequence('AB-.').gaps().tolist(),
+            [False, False, True, True])
+        self.assertEqual(set(ExampleGrammaredSequence._gap_codes), {45, 46})
+        self.assertFalse(ExampleGrammaredSequence._gap_hash[ord('~')])
+
+        class ExampleTildeGapSequence(ExampleGrammaredSequence):
+            @classproperty
+            def gap_chars(cls):
+                return set('-.~')
+
+        self.assertEqual(set(ExampleTildeGapSequence._gap_codes),
+                         {45, 46, 126})
+        self.assertTrue(ExampleTildeGapSequence._gap_hash[ord('~')])
+
+        seq = ExampleTildeGapSequence('AB~-')
+        self.assertEqual(seq.gaps().tolist(), [False, False, True, True])
+        self.assertEqual(str(seq.degap()), 'AB')
+
+        # parent class is unaffected
+        self.assertEqual(set(ExampleGrammaredSequence._gap_codes), {45, 46})
+        self.assertFalse(ExampleGrammaredSequence._gap_hash[ord('~')])
+        with self.assertRaisesRegex(ValueError, r"Invalid character.*'~'"):
+            ExampleGrammaredSequence('AB~')
+
+    def test_memos_subclass_redefines_degenerate_map(self):
+        self.assertTrue(ExampleGrammaredSequence('AX').has_degenerates())
+
+        class ExampleExtraDegenerateSequence(ExampleGrammaredSequence):
+            @classproperty
+            def degenerate_map(cls):
+                return {"X": set("AB"), "Y": set("BC"), "Z": set("AC"),
+                        "W": set("ABCQ"), "V": set("BC")}
+
+        seq = ExampleExtraDegenerateSequence('AV')
+        self.assertTrue(seq.has_degenerates())
+        self.assertEqual(seq.degenerates().tolist(), [False, True])
+        self.assertFalse(ExampleGrammaredSequence._degenerate_hash[ord('V')])
 
     def test_noncanonical_codes(self):
         noncanonical_codes = set(ExampleGrammaredSequence._noncanonical_codes)
@@ -13,7 +13,7 @@ from copy import copy
 
 import numpy as np
 
-from .__subsample import _subsample_counts_without_replacement
+from skbio.util import get_rng
 
 
 def isubsample(items, maximum, minimum=1, buf_size=1000, bin_f=None):
@@ -147,7 +147,7 @@ def isubsample(items, maximum, minimum=1, buf_size=1000, bin_f=None):
             yield (bin_, item)
 
 
-def subsample_counts(counts, n, replace=False):
+def subsample_counts(counts, n, replace=False, seed=None):
     """Randomly subsample from a vector of counts, with or without replacement.
 
     Parameters
@@ -160,6 +160,8 @@ def subsample_counts(counts, n, replace=False):
     replace : bool, optional
         If ``True``, subsample with replacement. If ``False`` (the default),
         subsample without replacement.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance.
 
     Returns
     -------
@@ -175,8 +177,6 @@ def subsample_counts(counts, n, replace=False):
     ValueError
         If `n` is less than zero or greater than the sum of `counts`
         when `replace=False`.
-    EfficiencyWarning
-        If the accelerated code isn't present or hasn't been compiled.
 
     See Also
     --------
@@ -193,6 +193,15 @@ def subsample_counts(counts, n, replace=False):
     equal to the number of items in `counts`, the subsampled vector that is
     returned may not necessarily be the same vector as `counts`.
 
+    Subsampling without replacement draws from a multivariate hypergeometric
+    distribution, and subsampling with replacement from a multinomial
+    distribution, using NumPy's random generator [1]_. Results are therefore
+    reproducible through `seed` rather than through ``np.random.seed``.
+
+    References
+    ----------
+    .. [1] https://numpy.org/doc/stable/reference/random/generator.html
+
     Examples
     --------
     Subsample 4 items (without replacement) from a vector of counts:
@@ -237,12 +246,13 @@ def subsample_counts(counts, n, replace=False):
             "counts vector when `replace=False`."
         )
 
+    rng = get_rng(seed)
     if replace:
         probs = counts / counts_sum
-        result = np.random.multinomial(n, probs)
+        result = rng.multinomial(n, probs)
     else:
         if counts_sum == n:
             result = counts
         else:
-            result = _subsample_counts_without_replacement(counts, n, counts_sum)
+            result = rng.multivariate_hypergeometric(counts, n)
     return result
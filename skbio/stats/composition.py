@@ -91,7 +91,7 @@ from scipy.stats import t, gmean
 
 from skbio.stats.distance import DistanceMatrix
 from skbio.util import find_duplicates
-from skbio.util._misc import get_rng
+from skbio.util import get_rng
 from skbio.util._warning import _warn_deprecated
 
 
@@ -10,9 +10,16 @@ import numpy as np
 from scipy.stats import pearsonr
 
 from skbio import DistanceMatrix
+from skbio.util import get_rng
 
+# Upper bound on the number of distances gathered at once when computing
+# permuted correlation coefficients in `hommola_cospeciation`.
+_PERM_BATCH_ELEMENTS = 2**20
 
-def hommola_cospeciation(host_dist, par_dist, interaction, permutations=999):
+
+def hommola_cospeciation(
+    host_dist, par_dist, interaction, permutations=999, seed=None
+):
     """Perform Hommola et al (2009) host/parasite cospeciation test.
 
     This test for host/parasite cospeciation is as described in [1]_. This test
@@ -72,6 +79,8 @@ def hommola_cospeciation(host_dist, par_dist, interaction, permutations=999):
         Number of permutations used to compute p-value. Must be greater than or
         equal to zero. If zero, statistical significance calculations will be
         skipped and the p-value will be ``np.nan``.
+    seed : int or np.random.Generator, optional
+        A user-provided random seed or random generator instance.
 
     Returns
     -------
@@ -118,12 +127,12 @@ def hommola_cospeciation(host_dist, par_dist, interaction, permutations=999):
     >>> interaction = [[1,0,0,0,0], [0,1,0,0,0], [0,0,1,0,0], [0,0,0,1,0],
     ...                [0,0,0,1,1]]
 
-    Run the cospeciation test with 99 permutations. Note that the correlation
-    coefficient for the observed values counts against the final reported
-    p-value:
+    Run the cospeciation test with 99 permutations (and a random seed for
+    reproducibility). Note that the correlation coefficient for the observed
+    values counts against the final reported p-value:
 
     >>> corr_coeff, p_value, perm_stats = hommola_cospeciation(
-    ...     hdist, pdist, interaction, permutations=99)
+    ...     hdist, pdist, interaction, permutations=99, seed=42)
     >>> print("%.3f" % corr_coeff)
     0.832
 
@@ -179,34 +188,68 @@ def hommola_cospeciation(host_dist, par_dist, interaction, permutations=999):
     # calculate the observed correlation coefficient for these hosts/symbionts
     corr_coeff = pearsonr(x, y)[0]
 
-    # now do permutatitons. initialize index lists of the appropriate size
-    mp = np.arange(num_pars)
-    mh = np.arange(num_hosts)
-
-    # initialize list of shuffled correlation vals
-    perm_stats = np.empty(permutations)
-
+    # now do permutatitons
+    rng = get_rng(seed)
     if permutations == 0 or np.isnan(corr_coeff):
         p_value = np.nan
-        perm_stats.fill(np.nan)
+        perm_stats = np.full(permutations, np.nan)
     else:
-        for i in range(permutations):
-            # generate a shuffled list of indexes for each permutation. this
-            # effectively randomizes which host is associated with which
-            # symbiont, but maintains the distribution of genetic distances
-            np.random.shuffle(mp)
-            np.random.shuffle(mh)
+        # generate a shuffled list of indexes for each permutation. this
+        # effectively randomizes which host is associated with which
+        # symbiont, but maintains the distribution of genetic distances.
+        # The first row is the unshuffled order, so that its statistic is
+        # computed the same way as the permuted ones and can be compared
+        # against them without rounding differences (see `mantel`).
+        par_perms = _permutation_rows(rng, num_pars, permutations)
+        host_perms = _permutation_rows(rng, num_hosts, permutations)
+
+        # get pairwise distances and correlation coefficients for a batch of
+        # permutations at a time, bounding the size of the gathered arrays
+        stats = np.empty(permutations + 1)
+        batch = max(1, _PERM_BATCH_ELEMENTS // len(x))
+        for start in range(0, permutations + 1, batch):
+            stop = start + batch
+            x_p = _get_dist(
+                hosts_k_labels, hosts_t_labels, host_dist.data, host_perms[start:stop]
+            )
+            y_p = _get_dist(
+                pars_k_labels, pars_t_labels, par_dist.data, par_perms[start:stop]
+            )
+            stats[start:stop] = _pearsonr_rows(x_p, y_p)
+
+        comp_stat = stats[0]
+        perm_stats = stats[1:]
+        p_value = ((perm_stats >= comp_stat).sum() + 1) / (permutations + 1)
 
-            # get pairwise distances in shuffled order
-            y_p = _get_dist(pars_k_labels, pars_t_labels, par_dist.data, mp)
-            x_p = _get_dist(hosts_k_labels, hosts_t_labels, host_dist.data, mh)
+    return corr_coeff, p_value, perm_stats
 
-            # calculate shuffled correlation coefficient
-            perm_stats[i] = pearsonr(x_p, y_p)[0]
 
-        p_value = ((perm_stats >= corr_coeff).sum() + 1) / (permutations + 1)
+def _permutation_rows(rng, n, permutations):
+    """Generate random permutations of ``range(n)``, one per row.
 
-    return corr_coeff, p_value, perm_stats
+    Parameters
+    ----------
+    rng : np.random.Generator
+        Random generator.
+    n : int
+        Number of items to permute.
+    permutations : int
+        Number of random permutations.
+
+    Returns
+    -------
+    numpy.array of int
+        Array of shape ``(permutations + 1, n)``. The first row is the
+        identity permutation and the remaining rows are random permutations.
+
+    """
+    # All permutations are drawn in one call by sorting random keys, rather
+    # than shuffling one row at a time (Generator.permuted requires
+    # NumPy >= 1.20).
+    perms = np.empty((permutations + 1, n), dtype=np.intp)
+    perms[0] = np.arange(n)
+    perms[1:] = rng.random((permutations, n)).argsort(axis=1)
+    return perms
 
 
 def _get_dist(k_labels, t_labels, dists, index):
@@ -221,15 +264,44 @@ def _get_dist(k_labels, t_labels, dists, index):
     dists : numpy.array
         pairwise distance matrix
     index : numpy.array of int
-        permutable indices for changing order in pairwise distance matrix
+        permutable indices for changing order in pairwise distance matrix.
+        May be 2D, in which case each row is a separate permutation.
 
     Returns
     -------
-    vec : list of float
-        List of distances associated with host:parasite edges.
+    vec : numpy.array of float
+        Distances associated with host:parasite edges. Has one row per row
+        of `index` if `index` is 2D.
 
     """
-    return dists[index[k_labels], index[t_labels]]
+    return dists[index[..., k_labels], index[..., t_labels]]
+
+
+def _pearsonr_rows(x, y):
+    """Compute Pearson correlation coefficients between matching rows.
+
+    Parameters
+    ----------
+    x, y : 2D numpy.array
+        Arrays of the same shape. Row ``i`` of `x` is correlated with row
+        ``i`` of `y`.
+
+    Returns
+    -------
+    numpy.array of float
+        Correlation coefficient of each pair of rows. ``np.nan`` where
+        either row is constant.
+
+    """
+    xm = x - x.mean(axis=1, keepdims=True)
+    ym = y - y.mean(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (xm * ym).sum(axis=1) / np.sqrt(
+            (xm * xm).sum(axis=1) * (ym * ym).sum(axis=1)
+        )
+    # as in scipy.stats.pearsonr, abs(r) > 1 can only be a floating point
+    # artifact
+    return np.clip(r, -1.0, 1.0)
 
 
 def _gen_lists(labels):
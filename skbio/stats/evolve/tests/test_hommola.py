@@ -10,10 +10,12 @@ import unittest
 
 import numpy as np
 import numpy.testing as npt
+from scipy.stats import pearsonr
 
 from skbio.stats.distance import mantel
 from skbio.stats.evolve import hommola_cospeciation
-from skbio.stats.evolve._hommola import _get_dist, _gen_lists
+from skbio.stats.evolve._hommola import (
+    _get_dist, _gen_lists, _pearsonr_rows, _permutation_rows)
 
 
 class HommolaCospeciationTests(unittest.TestCase):
@@ -54,50 +56,60 @@ class HommolaCospeciationTests(unittest.TestCase):
         self.interact_zero = np.array([[0, 0, 0], [0, 0, 0], [0, 0, 0]])
 
     def test_hommola_cospeciation_sig(self):
-        np.random.seed(1)
-
         obs_r, obs_p, obs_perm_stats = hommola_cospeciation(
-            self.hdist, self.pdist, self.interact, 9)
+            self.hdist, self.pdist, self.interact, 9, seed=42)
         exp_p = .1
         exp_r = 0.83170965463247915
-        exp_perm_stats = np.array([-0.14928122, 0.26299538, -0.21125858,
-                                   0.24143838, 0.61557855, -0.24258293,
-                                   0.09885203, 0.02858, 0.42742399])
-        self.assertAlmostEqual(obs_p, exp_p)
-        self.assertAlmostEqual(obs_r, exp_r)
+        exp_perm_stats = np.array([-0.270235545373, 0.055030594172,
+                                   -0.283447350099, 0.30645493471,
+                                   0.317931736202, -0.216429005543,
+                                   0.112060580272, 0.346777952435,
+                                   -0.350475380526])
+        npt.assert_allclose([obs_p, obs_r], [exp_p, exp_r])
 
         npt.assert_allclose(obs_perm_stats, exp_perm_stats)
 
     def test_hommola_cospeciation_asymmetric(self):
-        np.random.seed(1)
-
         obs_r, obs_p, obs_perm_stats = hommola_cospeciation(
-            self.hdist_4x4, self.pdist, self.interact_5x4, 9)
-        exp_p = 0.2
+            self.hdist_4x4, self.pdist, self.interact_5x4, 9, seed=42)
+        exp_p = 0.1
         exp_r = 0.85732140997411233
-        exp_perm_stats = np.array([-0.315244162496, -0.039405520312,
-                                   0.093429386594, -0.387835875941,
-                                   0.183711730709,  0.056057631956,
-                                   0.945732487487,  0.056057631956,
-                                   -0.020412414523])
-        self.assertAlmostEqual(obs_p, exp_p)
-        self.assertAlmostEqual(obs_r, exp_r)
+        exp_perm_stats = np.array([-0.186858773188, -0.44907311951,
+                                   -0.020412414523, 0.796084166405,
+                                   0.551135192126, -0.09851380078,
+                                   0.224536559755, 0.612372435696,
+                                   -0.224536559755])
+        npt.assert_allclose([obs_p, obs_r], [exp_p, exp_r])
 
         npt.assert_allclose(obs_perm_stats, exp_perm_stats)
 
     def test_hommola_cospeciation_no_sig(self):
-        np.random.seed(1)
-
         obs_r, obs_p, obs_perm_stats = hommola_cospeciation(
-            self.hdist, self.pdist, self.interact_ns, 9)
-        exp_p = .6
+            self.hdist, self.pdist, self.interact_ns, 9, seed=42)
+        exp_p = .5
         exp_r = -0.013679391379114569
-        exp_perm_stats = np.array([-0.22216543, -0.14836061, -0.04434843,
-                                   0.1478281, -0.29105645, 0.56395839,
-                                   0.47304992, 0.79125657, 0.06804138])
-        self.assertAlmostEqual(obs_p, exp_p)
-        self.assertAlmostEqual(obs_r, exp_r)
-        npt.assert_allclose(obs_perm_stats, exp_perm_stats)
+        exp_perm_stats = np.array([-0.191511479308, -0.375972259864, 0.,
+                                   -0.280236701193, 0.263752189358,
+                                   0.649406630673, -0.369570247493,
+                                   0.062745580514, -0.177393718797])
+        npt.assert_allclose([obs_p, obs_r], [exp_p, exp_r])
+        npt.assert_allclose(obs_perm_stats, exp_perm_stats, atol=1e-12)
+
+    def test_hommola_cospeciation_seed(self):
+        obs = hommola_cospeciation(self.hdist, self.pdist, self.interact, 99,
+                                   seed=42)
+
+        # a generator is used as is, and the global random state is unused
+        np.random.seed(1)
+        exp = hommola_cospeciation(self.hdist, self.pdist, self.interact, 99,
+                                   seed=np.random.default_rng(42))
+        self.assertEqual(obs[0], exp[0])
+        self.assertEqual(obs[1], exp[1])
+        npt.assert_array_equal(obs[2], exp[2])
+
+        with self.assertRaisesRegex(ValueError, "Invalid seed"):
+            hommola_cospeciation(self.hdist, self.pdist, self.interact, 9,
+                                 seed='foo')
 
     def test_hommola_vs_mantel(self):
         # we don't compare p-values because the two methods use different
@@ -137,6 +149,19 @@ class HommolaCospeciationTests(unittest.TestCase):
 
         npt.assert_allclose(actual_vec, expected_vec)
 
+    def test_get_dist_multiple_indices(self):
+        labels = np.array([0, 1, 1, 2, 3])
+        k_labels, t_labels = _gen_lists(labels)
+        dists = np.array([[0, 2, 6, 3], [2, 0, 5, 4], [6, 5, 0, 7],
+                          [3, 4, 7, 0]])
+        index = np.array([[2, 3, 1, 0], [0, 1, 2, 3]])
+
+        expected = np.array([[7, 7, 5, 6, 0, 4, 3, 4, 3, 2],
+                             [2, 2, 6, 3, 0, 5, 4, 5, 4, 7]])
+        actual = _get_dist(k_labels, t_labels, dists, index)
+
+        npt.assert_allclose(actual, expected)
+
     def test_gen_lists(self):
         exp_pars_k_labels = np.array([0, 0, 0, 0, 0, 1, 1, 1,
                                       1, 2, 2, 2, 3, 3, 4])
@@ -157,6 +182,35 @@ class HommolaCospeciationTests(unittest.TestCase):
         npt.assert_allclose(exp_host_k_labels, obs_hosts_k_labels)
         npt.assert_allclose(exp_host_t_labels, obs_hosts_t_labels)
 
+    def test_permutation_rows(self):
+        perms = _permutation_rows(np.random.default_rng(42), 5, 20)
+
+        self.assertEqual(perms.shape, (21, 5))
+        npt.assert_array_equal(perms[0], np.arange(5))
+        npt.assert_array_equal(np.sort(perms, axis=1),
+                               np.tile(np.arange(5), (21, 1)))
+        self.assertGreater(len(np.unique(perms, axis=0)), 1)
+
+    def test_permutation_rows_none(self):
+        perms = _permutation_rows(np.random.default_rng(42), 3, 0)
+        npt.assert_array_equal(perms, [[0, 1, 2]])
+
+    def test_pearsonr_rows(self):
+        rng = np.random.default_rng(42)
+        x = rng.random((4, 10))
+        y = rng.random((4, 10))
+
+        obs = _pearsonr_rows(x, y)
+
+        exp = [pearsonr(x_row, y_row)[0] for x_row, y_row in zip(x, y)]
+        npt.assert_allclose(obs, exp)
+
+    def test_pearsonr_rows_constant(self):
+        x = np.array([[1., 1., 1.], [1., 2., 3.]])
+        y = np.array([[1., 2., 3.], [3., 2., 1.]])
+
+        npt.assert_allclose(_pearsonr_rows(x, y), [np.nan, -1.])
+
     def test_dm_too_small(self):
         with self.assertRaises(ValueError):
             hommola_cospeciation(self.h_dist_2x2, self.p_dist_3x3,
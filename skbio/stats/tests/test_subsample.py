@@ -92,6 +92,18 @@ class SubsampleCountsTests(unittest.TestCase):
             actual.add(tuple(obs))
         self.assertTrue(len(actual) > 1)
 
+    def test_subsample_counts_seed(self):
+        a = np.array([2, 0, 1, 2, 1, 8, 6, 0, 3, 3, 5, 0, 0, 0, 5])
+        for replace in (False, True):
+            obs1 = subsample_counts(a, 20, replace=replace, seed=42)
+            obs2 = subsample_counts(a, 20, replace=replace, seed=42)
+            npt.assert_equal(obs1, obs2)
+            self.assertEqual(obs1.sum(), 20)
+            rng = np.random.default_rng(42)
+            obs3 = subsample_counts(a, 20, replace=replace, seed=rng)
+            npt.assert_equal(obs1, obs3)
+        self.assertTrue(np.all(subsample_counts(a, 20, seed=42) <= a))
+
     def test_subsample_counts_invalid_input(self):
         # Negative n.
         with self.assertRaises(ValueError):
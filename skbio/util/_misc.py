@@ -25,6 +25,22 @@ def resolve_key(obj, key):
     )
 
 
+def resolve_keys(objs, key):
+    """Resolve key for each object in an iterable.
+
+    Equivalent to ``[resolve_key(obj, key) for obj in objs]``, but the type of
+    `key` is only checked once.
+    """
+    if callable(key):
+        return [key(obj) for obj in objs]
+    objs = list(objs)
+    try:
+        return [obj.metadata[key] for obj in objs]
+    except AttributeError:
+        # raise resolve_key's error for the first object lacking metadata
+        return [resolve_key(obj, key) for obj in objs]
+
+
 def make_sentinel(name):
     return type(
         name,
@@ -12,7 +12,7 @@ import unittest
 import numpy as np
 
 from skbio.util import cardinal_to_ordinal, safe_md5, find_duplicates, get_rng
-from skbio.util._misc import MiniRegistry, chunk_str, resolve_key
+from skbio.util._misc import MiniRegistry, chunk_str, resolve_key, resolve_keys
 
 
 class TestMiniRegistry(unittest.TestCase):
@@ -148,6 +148,33 @@ class ResolveKeyTests(unittest.TestCase):
             resolve_key({'foo': 1}, 'foo')
 
 
+class ResolveKeysTests(unittest.TestCase):
+    class MetadataHaver(dict):
+        @property
+        def metadata(self):
+            return self
+
+    def test_callable(self):
+        self.assertEqual(resolve_keys(iter([1, 4]), str), ["1", "4"])
+
+    def test_index(self):
+        objs = [self.MetadataHaver({'foo': 123}),
+                self.MetadataHaver({'foo': 'baz'})]
+        self.assertEqual(resolve_keys(iter(objs), 'foo'), [123, 'baz'])
+
+    def test_empty(self):
+        self.assertEqual(resolve_keys([], 'foo'), [])
+
+    def test_wrong_type(self):
+        with self.assertRaisesRegex(TypeError, r"dict must have `metadata`"):
+            resolve_keys([self.MetadataHaver({'foo': 1}), {'foo': 1}], 'foo')
+
+    def test_missing_key(self):
+        with self.assertRaises(KeyError):
+            resolve_keys([self.MetadataHaver({'foo': 1}),
+                          self.MetadataHaver({})], 'foo')
+
+
 class ChunkStrTests(unittest.TestCase):
     def test_even_split(self):
         self.assertEqual(chunk_str('abcdef', 6, ' '), 'abcdef')